@@ -0,0 +1,168 @@
+"""Stand-in lbrynet JSON-RPC daemon for offline benchmarks.
+
+Implements the daemon methods migrate_to_odysee.py calls (resolve, publish, blob_list, blob_reflect, blob_clean,
+settings_get and the wallet calls used by --publish-workers) with configurable latency and failure rates.
+Run it on its own with: python benchmarks/fake_lbrynet.py --port 5279 --latency publish=0.5 --failure-rate 0.01
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+BLOB_SIZE = 2 * 1024 * 1024  # lbrynet splits streams into blobs of up to 2 MiB
+
+def parse_latencies(spec: str) -> Dict[str, float]:
+    """Parse 'method=seconds,...' into a latency map; the method '*' sets the default for every other method."""
+    latencies: Dict[str, float] = {}
+    for item in filter(None, spec.split(',')):
+        method, _, seconds = item.partition('=')
+        latencies[method.strip()] = float(seconds)
+    return latencies
+
+class FakeDaemon:
+    """In-memory state and method implementations behind the fake JSON-RPC server."""
+
+    def __init__(self, latencies: Optional[Dict[str, float]] = None, failure_rate: float = 0.0,
+                 data_dir: Optional[str] = None, balance: float = 100.0, seed: Optional[int] = None) -> None:
+        self.latencies = latencies or {}
+        self.failure_rate = failure_rate
+        self.data_dir = data_dir or tempfile.gettempdir()
+        self.balance = balance
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._streams: Dict[str, List[str]] = {}  # sd_hash -> blob hashes
+        self._claims: Dict[str, Dict] = {}  # claim URL (name, or @channel/name) -> claim
+        self._utxos: List[float] = [balance]
+        self.calls: Dict[str, int] = {}
+
+    def handle(self, method: str, params: Dict[str, Any]) -> Tuple[Optional[Any], Optional[str]]:
+        """Run one call, returning (result, error message)."""
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            fail = self._random.random() < self.failure_rate
+        time.sleep(self.latencies.get(method, self.latencies.get('*', 0.0)))
+        if fail and method != 'settings_get':
+            return None, f"Injected failure in {method}"
+        handler = getattr(self, f"rpc_{method}", None)
+        if handler is None:
+            return None, f"Unknown method: {method}"
+        try:
+            return handler(**params), None
+        except Exception as e:
+            return None, str(e)
+
+    def rpc_resolve(self, urls: Any, **_: Any) -> Dict[str, Dict]:
+        urls = [urls] if isinstance(urls, str) else urls
+        with self._lock:
+            return {url: self._claims.get(url.replace('lbry://', ''), {'error': {'name': 'NOT_FOUND', 'text': f"Could not find claim at \"{url}\"."}})
+                    for url in urls}
+
+    def rpc_publish(self, name: str, file_path: str = '', bid: str = '0.001', channel_name: Optional[str] = None, **_: Any) -> Dict:
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            size = BLOB_SIZE
+        sd_hash = hashlib.sha384(f"{name}:{file_path}:{time.time()}".encode()).hexdigest()
+        claim_id = hashlib.sha1(sd_hash.encode()).hexdigest()
+        blobs = [hashlib.sha384(f"{sd_hash}:{i}".encode()).hexdigest() for i in range(size // BLOB_SIZE + 1)]
+        claim = {'name': name, 'claim_id': claim_id, 'value_type': 'stream', 'value': {'source': {'sd_hash': sd_hash}}}
+        with self._lock:
+            self._streams[sd_hash] = [sd_hash] + blobs
+            self._claims[f"{channel_name}/{name}" if channel_name else name] = claim  # Resolvable as lbry://@channel/name
+            self.balance -= float(bid)
+        return {'outputs': [claim], 'total_fee': '0.0001'}
+
+    def rpc_blob_list(self, sd_hash: Optional[str] = None, page: int = 1, page_size: int = 20, **_: Any) -> Dict:
+        with self._lock:
+            blobs = self._streams.get(sd_hash, []) if sd_hash else [b for s in self._streams.values() for b in s]
+        total_pages = max(1, -(-len(blobs) // page_size))
+        return {'items': blobs[(page - 1) * page_size:page * page_size], 'page': page, 'page_size': page_size,
+                'total_pages': total_pages, 'total_items': len(blobs)}
+
+    def rpc_blob_reflect(self, blob_hashes: List[str], reflector_server: Optional[str] = None, **_: Any) -> List[str]:
+        return list(blob_hashes)
+
+    def rpc_blob_clean(self, **_: Any) -> bool:
+        return True
+
+    def rpc_settings_get(self, **_: Any) -> Dict:
+        return {'data_dir': self.data_dir}
+
+    def rpc_wallet_balance(self, **_: Any) -> Dict:
+        with self._lock:
+            return {'available': f"{self.balance:.8f}", 'reserved': '0.0', 'total': f"{self.balance:.8f}"}
+
+    def rpc_utxo_list(self, page: int = 1, page_size: int = 20, **_: Any) -> Dict:
+        with self._lock:
+            items = [{'txid': f"{i:064x}", 'nout': 0, 'amount': f"{amount:.8f}"} for i, amount in enumerate(self._utxos)]
+        return {'items': items[(page - 1) * page_size:page * page_size], 'page': page,
+                'total_pages': max(1, -(-len(items) // page_size))}
+
+    def rpc_account_fund(self, amount: str = '0', outputs: int = 1, **_: Any) -> Dict:
+        with self._lock:
+            self._utxos = [float(amount) / outputs] * outputs
+        return {'txid': hashlib.sha256(str(time.time()).encode()).hexdigest()}
+
+def make_handler(daemon: FakeDaemon) -> type:
+    """Build a request handler class bound to one FakeDaemon."""
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format: str, *args: Any) -> None:
+            pass  # Keep benchmark output clean
+
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            if isinstance(body, list):
+                response: Any = [self._call(request) for request in body]
+            else:
+                response = self._call(body)
+            data = json.dumps(response).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _call(self, request: Dict) -> Dict:
+            result, error = daemon.handle(request.get('method', ''), request.get('params') or {})
+            if error is not None:
+                return {'jsonrpc': '2.0', 'id': request.get('id'), 'error': {'code': -32500, 'message': error}}
+            return {'jsonrpc': '2.0', 'id': request.get('id'), 'result': result}
+
+    return Handler
+
+def start_server(daemon: FakeDaemon, host: str = '127.0.0.1', port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve a FakeDaemon in a background thread, returning the server and its URL."""
+    server = ThreadingHTTPServer((host, port), make_handler(daemon))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-lbrynet", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake lbrynet JSON-RPC daemon for offline benchmarks.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5279)
+    parser.add_argument('--latency', default='', help="Per-method latency in seconds, e.g. publish=0.5,resolve=0.02,*=0.001")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Fraction of calls that return a JSON-RPC error")
+    parser.add_argument('--data-dir', default=None, help="Directory reported as the daemon's data_dir")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    daemon = FakeDaemon(parse_latencies(args.latency), args.failure_rate, args.data_dir, seed=args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(daemon))
+    server.daemon_threads = True
+    print(f"Fake lbrynet listening on http://{args.host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
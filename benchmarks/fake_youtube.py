@@ -0,0 +1,162 @@
+"""Stand-in for yt_dlp.YoutubeDL that serves a synthetic channel and writes generated media files, for offline benchmarks.
+
+FakeYoutubeDL subclasses the real YoutubeDL so option handling and match filters run exactly as they do against YouTube;
+only extract_info, process_ie_result and download are replaced. Call install() before migrate_to_odysee.main() runs.
+"""
+import datetime
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import yt_dlp
+
+CHANNEL_URL = "https://www.youtube.com/@benchmark"
+VIDEOS_PER_DAY = 10  # Upload dates step back one day every VIDEOS_PER_DAY entries, newest first
+
+class FakeChannel:
+    """Settings for the synthetic channel every FakeYoutubeDL instance serves."""
+
+    size = 100
+    media_bytes = 1024 * 1024
+    latency = 0.0
+    failure_rate = 0.0
+    newest = datetime.date.today()
+    _random = random.Random(0)
+    _lock = threading.Lock()
+    extract_calls = 0
+    download_calls = 0
+
+    @classmethod
+    def video_id(cls, index: int) -> str:
+        return f"bench{index:06d}"  # 11 characters, like a YouTube id
+
+    @classmethod
+    def index_of(cls, url: str) -> Optional[int]:
+        """Map a watch/shorts URL or bare id back to its entry index, or None if it isn't one of ours."""
+        vid_id = url.rsplit('v=', 1)[-1].rsplit('/', 1)[-1]
+        if not vid_id.startswith('bench') or not vid_id[5:].isdigit():
+            return None
+        index = int(vid_id[5:])
+        return index if index < cls.size else None
+
+    @classmethod
+    def upload_date(cls, index: int) -> datetime.date:
+        return cls.newest - datetime.timedelta(days=index // VIDEOS_PER_DAY)
+
+    @classmethod
+    def oldest(cls) -> datetime.date:
+        return cls.upload_date(cls.size - 1)
+
+    @classmethod
+    def simulate_request(cls, url: str) -> None:
+        """Count the request, wait out the configured latency and inject failures at the configured rate."""
+        with cls._lock:
+            fail = cls._random.random() < cls.failure_rate
+        if cls.latency:
+            time.sleep(cls.latency)
+        if fail:
+            raise yt_dlp.utils.DownloadError(f"ERROR: [youtube] Injected failure for {url}")
+
+def install(size: int, media_bytes: int = 1024 * 1024, latency: float = 0.0, failure_rate: float = 0.0,
+            seed: int = 0) -> None:
+    """Configure the synthetic channel and substitute FakeYoutubeDL for yt_dlp.YoutubeDL."""
+    FakeChannel.size = size
+    FakeChannel.media_bytes = media_bytes
+    FakeChannel.latency = latency
+    FakeChannel.failure_rate = failure_rate
+    FakeChannel._random = random.Random(seed)
+    yt_dlp.YoutubeDL = FakeYoutubeDL
+
+def full_info(index: int) -> Dict:
+    """Full info dict for one entry, shaped like yt-dlp's after format selection of an H.264/AAC pair."""
+    vid_id = FakeChannel.video_id(index)
+    audio_bytes = FakeChannel.media_bytes // 10
+    requested_formats: List[Dict] = [
+        {'format_id': '137', 'ext': 'mp4', 'vcodec': 'avc1.640028', 'acodec': 'none', 'width': 1920, 'height': 1080,
+         'fps': 30, 'filesize': FakeChannel.media_bytes - audio_bytes},
+        {'format_id': '140', 'ext': 'm4a', 'vcodec': 'none', 'acodec': 'mp4a.40.2', 'filesize': audio_bytes},
+    ]
+    return {
+        'id': vid_id,
+        'title': f"Benchmark video {index}",
+        'description': f"Synthetic video {index} generated for benchmarking.\n" * 5,
+        'upload_date': FakeChannel.upload_date(index).strftime('%Y%m%d'),
+        'duration': 60 + index % 1200,
+        'thumbnail': f"https://i.ytimg.com/vi/{vid_id}/maxresdefault.jpg",
+        'tags': ['benchmark', f"tag{index % 50}"],
+        'live_status': 'not_live',
+        'was_live': False,
+        'availability': 'public',
+        'age_limit': 0,
+        'view_count': index * 7,
+        'webpage_url': f"https://www.youtube.com/watch?v={vid_id}",
+        'original_url': f"https://www.youtube.com/watch?v={vid_id}",
+        'channel_url': CHANNEL_URL,
+        'extractor': 'youtube',
+        'extractor_key': 'Youtube',
+        'format_id': '137+140',
+        'requested_formats': requested_formats,
+        'vcodec': 'avc1.640028',
+        'acodec': 'mp4a.40.2',
+        'width': 1920,
+        'height': 1080,
+        'fps': 30,
+        'ext': 'mp4',
+    }
+
+def flat_entries(size: int) -> Iterator[Dict]:
+    """Lazily yield a channel tab's flat entries, newest first, like yt-dlp's paged tab extractor."""
+    for index in range(size):
+        vid_id = FakeChannel.video_id(index)
+        yield {'_type': 'url', 'ie_key': 'Youtube', 'id': vid_id, 'title': f"Benchmark video {index}",
+               'url': f"https://www.youtube.com/watch?v={vid_id}"}
+
+class FakeYoutubeDL(yt_dlp.YoutubeDL):
+    """YoutubeDL whose extractor and downloader are replaced by the synthetic channel."""
+
+    def extract_info(self, url: str, download: bool = True, ie_key: Optional[str] = None, extra_info: Any = None,
+                     process: bool = True, force_generic_extractor: bool = False) -> Dict:
+        with FakeChannel._lock:
+            FakeChannel.extract_calls += 1
+        FakeChannel.simulate_request(url)
+        if url.rstrip('/').startswith(CHANNEL_URL):
+            # Only the videos tab has entries; streams and shorts tabs are empty
+            size = FakeChannel.size if url.rstrip('/').endswith('/videos') else 0
+            entries = flat_entries(size) if not process else list(flat_entries(size))
+            return {'_type': 'playlist', 'id': 'UCbenchmark', 'title': 'Benchmark - Videos', 'webpage_url': url,
+                    'original_url': url, 'entries': entries}
+        index = FakeChannel.index_of(url)
+        if index is None:
+            raise yt_dlp.utils.DownloadError(f"ERROR: [youtube] {url}: Video unavailable")
+        return full_info(index)
+
+    def process_ie_result(self, ie_result: Dict, download: bool = True, extra_info: Any = None) -> Dict:
+        # Fake info dicts come with their formats already selected, so there is nothing to process
+        if download and ie_result.get('_type', 'video') == 'video':
+            with FakeChannel._lock:
+                FakeChannel.download_calls += 1
+            FakeChannel.simulate_request(ie_result['webpage_url'])
+            self._write_media(ie_result['id'])
+        return ie_result
+
+    def download(self, url_list: List[str]) -> int:
+        for url in url_list:
+            index = FakeChannel.index_of(url)
+            if index is None:
+                raise yt_dlp.utils.DownloadError(f"ERROR: [youtube] {url}: Video unavailable")
+            self.process_ie_result(full_info(index), download=True)
+        return 0
+
+    def _write_media(self, vid_id: str) -> None:
+        outtmpl = self.params['outtmpl']
+        template = outtmpl.get('default') if isinstance(outtmpl, dict) else outtmpl
+        path = template % {'id': vid_id, 'ext': self.params.get('merge_output_format') or 'mp4'}
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as f:
+            remaining = FakeChannel.media_bytes
+            chunk = os.urandom(min(remaining, 1024 * 1024))
+            while remaining > 0:
+                f.write(chunk[:remaining])
+                remaining -= len(chunk)
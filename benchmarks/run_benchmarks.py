@@ -0,0 +1,155 @@
+"""Offline end-to-end benchmark of migrate_to_odysee.py against a fake lbrynet daemon and a fake YouTube channel.
+
+Each channel size runs main() in its own process and working directory, so video_log.db, the logs and peak RSS are
+per run. Reports throughput in videos per hour, per-stage latency percentiles from the script's stage metrics and peak RSS.
+
+    python benchmarks/run_benchmarks.py --videos 100,1000,10000 --latency publish=0.2,*=0.005 -- --publish-workers 4
+
+Arguments after -- are passed on to migrate_to_odysee.py.
+"""
+import argparse
+import builtins
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None  # type: ignore
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path[:0] = [REPO_DIR, BENCH_DIR]
+
+# The config section of migrate_to_odysee.py is filled in by hand; the benchmark channel comes from --channels-config,
+# so the placeholders only need to exist. Set at import time so media pool processes (spawned) can import it too.
+builtins.REPLACE = None  # type: ignore[attr-defined]
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered) + 0.5) - 1))]
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MiB, or None where the OS doesn't report it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024  # bytes on macOS, KiB on Linux
+
+def run_single(args: argparse.Namespace, extra: List[str]) -> Dict:
+    """Migrate one synthetic channel of args.single videos in a fresh working directory and measure it."""
+    import fake_youtube
+    import migrate_to_odysee
+
+    fake_youtube.install(args.single, args.media_bytes, args.extract_latency, args.extract_failure_rate)
+    work_dir = tempfile.mkdtemp(prefix=f"odysee-bench-{args.single}-")
+    os.chdir(work_dir)
+    with open("channels.json", 'w', encoding='utf-8') as f:
+        json.dump([{'youtube_channel_url': fake_youtube.CHANNEL_URL, 'odysee_channel_name': '@benchmark',
+                    'content_type': 'videos', 'start_date': fake_youtube.FakeChannel.oldest().strftime('%m-%d-%Y')}], f)
+
+    sys.argv = ['migrate_to_odysee.py', '--channels-config', 'channels.json', '--temp-folder', os.path.join(work_dir, 'downloads'),
+                '--daemon-url', args.daemon_url, '--requests-per-second', '1000', '--max-requests-per-second', '1000',
+                '--blob-dir', work_dir, '--profile', *extra]
+    builtins.input = lambda prompt='': ''  # Accept the video list confirm_videos shows
+    started = time.monotonic()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        migrate_to_odysee.main()
+    elapsed = time.monotonic() - started
+
+    durations = migrate_to_odysee.metrics.samples()  # --profile keeps every stage's durations
+    successful = failed = 0
+    with open("migration_events.jsonl", 'r', encoding='utf-8') as f:
+        for line in f:
+            event = json.loads(line)
+            if 'successful' in event:
+                successful, failed = event['successful'], event['failed']
+    return {
+        'videos': args.single,
+        'successful': successful,
+        'failed': failed,
+        'seconds': elapsed,
+        'videos_per_hour': successful / elapsed * 3600 if elapsed else 0.0,
+        'peak_rss_mb': peak_rss_mb(),
+        'stages': {stage: {'count': len(values), 'p50': percentile(values, 0.5), 'p90': percentile(values, 0.9),
+                           'p99': percentile(values, 0.99)} for stage, values in sorted(durations.items())},
+        'work_dir': work_dir,
+    }
+
+def start_daemon(args: argparse.Namespace) -> Tuple[subprocess.Popen, str]:
+    """Start fake_lbrynet.py in its own process and wait until it is accepting calls, returning it and its URL."""
+    command = [sys.executable, os.path.join(BENCH_DIR, 'fake_lbrynet.py'), '--port', str(args.port),
+               '--latency', args.latency, '--failure-rate', str(args.failure_rate), '--seed', '0']
+    daemon = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = daemon.stdout.readline() if daemon.stdout else ''
+    if not line.startswith("Fake lbrynet listening on"):
+        daemon.kill()
+        raise RuntimeError(f"Fake lbrynet daemon failed to start: {line.strip()}")
+    return daemon, line.split()[-1]
+
+def print_report(results: List[Dict]) -> None:
+    print(f"{'videos':>8} {'ok':>8} {'failed':>7} {'seconds':>9} {'videos/hour':>12} {'peak RSS MiB':>13}")
+    for result in results:
+        rss = f"{result['peak_rss_mb']:.1f}" if result['peak_rss_mb'] is not None else 'n/a'
+        print(f"{result['videos']:>8} {result['successful']:>8} {result['failed']:>7} {result['seconds']:>9.1f} "
+              f"{result['videos_per_hour']:>12.0f} {rss:>13}")
+    print()
+    print(f"{'videos':>8} {'stage':<10} {'count':>7} {'p50 s':>9} {'p90 s':>9} {'p99 s':>9}")
+    for result in results:
+        for stage, stats in result['stages'].items():
+            print(f"{result['videos']:>8} {stage:<10} {stats['count']:>7} {stats['p50']:>9.4f} {stats['p90']:>9.4f} "
+                  f"{stats['p99']:>9.4f}")
+
+def main() -> None:
+    argv = sys.argv[1:]
+    extra = argv[argv.index('--') + 1:] if '--' in argv else []
+    argv = argv[:argv.index('--')] if '--' in argv else argv
+
+    parser = argparse.ArgumentParser(description="Offline benchmark of migrate_to_odysee.py with a fake daemon and fake YouTube.")
+    parser.add_argument('--videos', default='100,1000', help="Comma-separated channel sizes to benchmark (e.g. 100,1000,10000,50000)")
+    parser.add_argument('--media-bytes', type=int, default=1024 * 1024, help="Size of each generated media file")
+    parser.add_argument('--latency', default='', help="Fake daemon latency per method in seconds, e.g. publish=0.2,*=0.005")
+    parser.add_argument('--failure-rate', type=float, default=0.0,
+                        help="Fraction of daemon calls that fail (failed publishes and reflections wait out the script's real retry delays)")
+    parser.add_argument('--extract-latency', type=float, default=0.0, help="Seconds each fake YouTube request takes")
+    parser.add_argument('--extract-failure-rate', type=float, default=0.0, help="Fraction of fake YouTube requests that fail")
+    parser.add_argument('--port', type=int, default=0, help="Port for the fake daemon (0 picks a free one)")
+    parser.add_argument('--output', default=None, help="Also write the results as JSON to this file")
+    parser.add_argument('--daemon-url', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--single', type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single is not None:
+        print(json.dumps(run_single(args, extra)))
+        return
+
+    results: List[Dict] = []
+    for size in [int(size) for size in args.videos.split(',') if size.strip()]:
+        # A fresh daemon per run, so claims published by the previous run don't resolve as already migrated
+        daemon, daemon_url = start_daemon(args)
+        try:
+            command = [sys.executable, os.path.abspath(__file__), *argv, '--single', str(size), '--daemon-url', daemon_url, '--', *extra]
+            print(f"Benchmarking a channel of {size} videos...", file=sys.stderr)
+            output = subprocess.run(command, capture_output=True, text=True)
+        finally:
+            daemon.terminate()
+            daemon.wait()
+        if output.returncode != 0:
+            print(output.stderr, file=sys.stderr)
+            raise SystemExit(f"Benchmark of {size} videos failed.")
+        results.append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+    print_report(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=4)
+
+if __name__ == "__main__":
+    main()
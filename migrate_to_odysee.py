@@ -1,15 +1,34 @@
 import argparse
+import concurrent.futures
+import contextlib
 import datetime
 import glob
+import http.server
+import itertools
 import json
+import logging
+import logging.handlers
+import multiprocessing
 import os
+import queue
 import re
-import subprocess  # For ffprobe/ffmpeg in is_vertical_short and audio normalization
+import shutil
+import socket
+import sqlite3
+import subprocess  # For ffprobe/ffmpeg in media jobs and audio normalization
 import sys
+import threading
 import time
-from typing import Dict, List, Optional
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, MutableMapping, Optional, Set, Tuple, TypeVar
+
+try:
+    import resource  # POSIX only; used to report the CPU time of ffmpeg/ffprobe jobs
+except ImportError:
+    resource = None  # type: ignore[assignment]
 
 import requests
+import requests.adapters
 import yt_dlp
 
 # Configuration Section - User Required Data
@@ -18,6 +37,271 @@ YOUTUBE_CHANNEL_URL: str = REPLACE  # Your YouTube channel URL
 ODYSEE_CHANNEL_NAME: str = REPLACE  # Optional: Replace with your Odysee channel name (e.g., "@mychannel") or leave as None
 ODYSEE_BID: str = "0.001"  # Amount of LBC to bid for each claim (required for publishing)
 
+LBRY_DAEMON_URL: str = "http://localhost:5279"  # Default lbrynet JSON-RPC endpoint (override with --daemon-url)
+REFLECTOR_SERVERS: List[str] = [
+    "reflector.lbry.com:5566",
+    "lbryumx1.lbry.com:5566",
+    "lbryumx2.lbry.com:5566",
+    "blobcache-eu.odycdn.com:5567",
+    "blobcache-eu.odycdn.com:5568",
+    "blobcache-eu.odycdn.com:5569"
+]
+
+T = TypeVar('T')
+_PROBE_CACHE: Dict[Tuple[str, int, float], Tuple[int, int]] = {}  # (path, size, mtime) -> (width, height)
+_PROBE_CACHE_LOCK = threading.Lock()
+_PREFETCH_DONE = object()  # Sentinel marking the end of a prefetch queue
+
+logger = logging.getLogger('migrate_to_odysee')
+
+def log_event(message: str, level: int = logging.INFO, **fields: Any) -> None:
+    """Log a migration event; fields such as vid_id, stage, duration and error become keys of its JSONL record.
+
+    Events with a stage and a duration are also counted in the stage metrics, even at levels the log files leave out.
+    """
+    if fields.get('duration') is not None and fields.get('stage') not in (None, 'run'):
+        metrics.observe(fields['stage'], fields['duration'], fields.get('vid_id'), fields.get('bytes'),
+                        failed=fields.get('error') is not None)
+    logger.log(level, message, extra={'event_fields': fields})
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each log record as one JSON object per line, with the event fields given to log_event as top-level keys."""
+
+    def __init__(self, run_id: str) -> None:
+        super().__init__()
+        self.run_id = run_id
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = {
+            'time': datetime.datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'run': self.run_id,
+            'level': record.levelname.lower(),
+            'message': record.getMessage(),
+        }
+        event.update((key, value) for key, value in getattr(record, 'event_fields', {}).items() if value is not None)
+        if record.exc_info:
+            event['traceback'] = self.formatException(record.exc_info)
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+class TimedMemoryHandler(logging.handlers.MemoryHandler):
+    """MemoryHandler that also flushes on a timer, so buffered records reach the file within flush_interval seconds on quiet stretches."""
+
+    def __init__(self, capacity: int, target: logging.Handler, flush_interval: float) -> None:
+        super().__init__(capacity, flushLevel=logging.ERROR, target=target)
+        self.flush_interval = flush_interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="log-flush", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        self._stop.set()
+        target = self.target
+        super().close()  # Flushes whatever is still buffered
+        if target:
+            target.close()
+
+def setup_logging(log_file: str, events_file: str, max_bytes: int = 50 * 1024 * 1024, backups: int = 10,
+                  flush_interval: float = 2.0, buffer_size: int = 500) -> str:
+    """Send migration events to the plain-text log and the JSONL event log through buffers flushed on a timer, returning the run id.
+
+    Each run starts a fresh log_file; the previous one is rotated to log_file.1 and so on instead of being truncated.
+    The event log keeps appending across runs (rotating by size) so throughput can be compared between runs.
+    """
+    run_id = f"{datetime.datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+    text_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backups, encoding='utf-8')
+    if os.path.getsize(log_file):
+        text_handler.doRollover()
+    text_handler.setFormatter(logging.Formatter('%(message)s'))
+    events_handler = logging.handlers.RotatingFileHandler(events_file, maxBytes=max_bytes, backupCount=backups, encoding='utf-8')
+    events_handler.setFormatter(JsonLinesFormatter(run_id))
+
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    for target in (text_handler, events_handler):
+        logger.addHandler(TimedMemoryHandler(buffer_size, target, flush_interval))
+    return run_id
+
+class StageMetrics:
+    """Thread-safe timing and byte counters per stage, fed by log_event for every event with a stage and a duration."""
+
+    BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0, float('inf'))  # Histogram upper bounds in seconds
+
+    def __init__(self) -> None:
+        self.detailed = False  # Keep every sample and per-video totals for the --profile summary
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict] = {}
+        self._samples: Dict[str, List[float]] = {}
+        self._videos: Dict[str, Dict[str, float]] = {}  # id -> stage -> seconds
+
+    def observe(self, stage: str, seconds: float, vid_id: Optional[str] = None, nbytes: Optional[int] = None,
+                failed: bool = False) -> None:
+        """Record one timed piece of work in a stage."""
+        with self._lock:
+            stats = self._stages.setdefault(stage, {'count': 0, 'seconds': 0.0, 'max': 0.0, 'bytes': 0, 'failures': 0,
+                                                    'buckets': [0] * len(self.BUCKETS)})
+            stats['count'] += 1
+            stats['seconds'] += seconds
+            stats['max'] = max(stats['max'], seconds)
+            stats['bytes'] += nbytes or 0
+            stats['failures'] += failed
+            stats['buckets'][next(i for i, bound in enumerate(self.BUCKETS) if seconds <= bound)] += 1
+            if self.detailed:
+                self._samples.setdefault(stage, []).append(seconds)
+                if vid_id:
+                    video = self._videos.setdefault(vid_id, {})
+                    video[stage] = video.get(stage, 0.0) + seconds
+
+    def samples(self) -> Dict[str, List[float]]:
+        """Copy of every duration recorded per stage (only kept while detailed is set)."""
+        with self._lock:
+            return {stage: list(values) for stage, values in self._samples.items()}
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Copy of the per-stage counters."""
+        with self._lock:
+            return {stage: {**stats, 'buckets': list(stats['buckets'])} for stage, stats in self._stages.items()}
+
+    def prometheus_text(self) -> str:
+        """Render the counters in the Prometheus text exposition format."""
+        lines = [
+            "# HELP odysee_migration_stage_duration_seconds Time spent per piece of work in each migration stage.",
+            "# TYPE odysee_migration_stage_duration_seconds histogram",
+        ]
+        stages = self.snapshot()
+        for stage, stats in sorted(stages.items()):
+            cumulative = 0
+            for bound, count in zip(self.BUCKETS, stats['buckets']):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else f"{bound:g}"
+                lines.append(f'odysee_migration_stage_duration_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'odysee_migration_stage_duration_seconds_sum{{stage="{stage}"}} {stats["seconds"]:.6f}')
+            lines.append(f'odysee_migration_stage_duration_seconds_count{{stage="{stage}"}} {stats["count"]}')
+        for name, key, help_text in (('bytes_total', 'bytes', "Bytes moved by each migration stage."),
+                                     ('failures_total', 'failures', "Failed pieces of work in each migration stage.")):
+            lines.append(f"# HELP odysee_migration_stage_{name} {help_text}")
+            lines.append(f"# TYPE odysee_migration_stage_{name} counter")
+            lines.extend(f'odysee_migration_stage_{name}{{stage="{stage}"}} {stats[key]}' for stage, stats in sorted(stages.items()))
+        lines.append("# HELP odysee_migration_last_update_timestamp_seconds When these metrics were rendered.")
+        lines.append("# TYPE odysee_migration_last_update_timestamp_seconds gauge")
+        lines.append(f"odysee_migration_last_update_timestamp_seconds {time.time():.3f}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self, slowest: int = 20) -> str:
+        """Human-readable per-run profile: stage totals and percentiles, duration histograms and the slowest videos."""
+        stages = self.snapshot()
+        samples = {stage: sorted(values) for stage, values in self.samples().items()}
+        with self._lock:
+            videos = sorted(self._videos.items(), key=lambda item: sum(item[1].values()), reverse=True)[:slowest]
+
+        def percentile(values: List[float], fraction: float) -> str:
+            return f"{values[min(len(values) - 1, int(fraction * len(values)))]:.2f}" if values else '-'
+
+        lines = [f"{'stage':<10} {'count':>7} {'failed':>6} {'total s':>10} {'mean s':>8} {'p50 s':>8} {'p90 s':>8} "
+                 f"{'p99 s':>8} {'max s':>8} {'MiB':>10}"]
+        for stage, stats in sorted(stages.items()):
+            values = samples.get(stage, [])
+            lines.append(f"{stage:<10} {stats['count']:>7} {stats['failures']:>6} {stats['seconds']:>10.1f} "
+                         f"{stats['seconds'] / stats['count']:>8.2f} {percentile(values, 0.5):>8} {percentile(values, 0.9):>8} "
+                         f"{percentile(values, 0.99):>8} {stats['max']:>8.2f} {stats['bytes'] / 1024 ** 2:>10.1f}")
+
+        for stage, stats in sorted(stages.items()):
+            lines += ["", f"{stage} durations:"]
+            buckets = stats['buckets']
+            widest = max(buckets) or 1
+            used = [i for i, count in enumerate(buckets) if count]
+            for i in range(used[0], used[-1] + 1) if used else []:  # Leave out the empty buckets at either end
+                label = f"> {self.BUCKETS[i - 1]:g}s" if self.BUCKETS[i] == float('inf') else f"<= {self.BUCKETS[i]:g}s"
+                lines.append(f"  {label:>9} {buckets[i]:>7} {'#' * round(40 * buckets[i] / widest)}")
+
+        if videos:
+            lines += ["", f"Slowest {len(videos)} videos:"]
+            for vid_id, times in videos:
+                breakdown = ', '.join(f"{stage} {seconds:.1f}s" for stage, seconds in sorted(times.items(), key=lambda item: -item[1]))
+                lines.append(f"  {vid_id}  {sum(times.values()):>9.1f}s  ({breakdown})")
+        return "\n".join(lines) + "\n"
+
+metrics = StageMetrics()
+
+def write_profile(profile_file: str, run_id: str, stage_metrics: StageMetrics, elapsed: float) -> None:
+    """Write the --profile summary of a run: stage totals, percentiles, duration histograms and the slowest videos."""
+    with open(profile_file, 'w', encoding='utf-8') as f:
+        f.write(f"Run {run_id}: {format_duration(elapsed)} wall time\n\n")
+        f.write(stage_metrics.summary())
+    log_event(f"Wrote the run profile to {profile_file}", stage='run')
+    print(f"Run profile written to {profile_file}.")
+
+class MetricsExporter:
+    """Publishes the stage metrics for Prometheus, as a textfile for node_exporter rewritten on a timer and/or on a local /metrics endpoint."""
+
+    def __init__(self, stage_metrics: StageMetrics, textfile: Optional[str] = None, port: Optional[int] = None,
+                 interval: float = 15.0) -> None:
+        self.metrics = stage_metrics
+        self.textfile = textfile
+        self.interval = interval
+        self.server: Optional[http.server.ThreadingHTTPServer] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if port is not None:
+            self.server = http.server.ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+            self.server.daemon_threads = True
+            threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True).start()
+            log_event(f"Serving metrics on http://127.0.0.1:{self.server.server_address[1]}/metrics", stage='run')
+        if textfile:
+            self._thread = threading.Thread(target=self._run, name="metrics-textfile", daemon=True)
+            self._thread.start()
+
+    def _handler(self) -> type:
+        stage_metrics = self.metrics
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = stage_metrics.prometheus_text().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass  # Scrapes would otherwise print a line to the console every few seconds
+
+        return Handler
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.write_textfile()
+
+    def write_textfile(self) -> None:
+        """Rewrite the textfile atomically so node_exporter never reads half of it."""
+        if not self.textfile:
+            return
+        tmp_file = f"{self.textfile}.tmp"
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(self.metrics.prometheus_text())
+            os.replace(tmp_file, self.textfile)
+        except OSError as e:
+            log_event(f"Failed to write metrics to {self.textfile}: {e}", level=logging.WARNING, stage='run', error=str(e))
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.write_textfile()  # Leave the final numbers behind
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
 def format_duration(seconds: float) -> str:
     """Format duration in seconds to HH:MM:SS."""
     seconds = int(seconds)  # Convert to integer to avoid float issues
@@ -31,6 +315,14 @@ def parse_duration(duration_str: str) -> int:
     h, m, s = map(int, duration_str.split(':'))
     return h * 3600 + m * 60 + s
 
+def parse_size(size: str) -> int:
+    """Parse a byte count with an optional K/M/G/T suffix (powers of 1024), e.g. 500G, into bytes."""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*', size, re.IGNORECASE)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid size: {size}")
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** ('KMGT'.find(unit.upper()) + 1 if unit else 0))
+
 def determine_type(info: Dict) -> str:
     """Determine the type of content based on video info."""
     if 'shorts' in info.get('original_url', ''):
@@ -50,18 +342,684 @@ def sanitize_name(name: str) -> str:
     name = name.strip('-_')
     return name
 
+def claim_url(channel_name: Optional[str], title: str) -> str:
+    """URL a video's claim is published under: its name within the Odysee channel, or the bare name when publishing anonymously."""
+    name = sanitize_name(title)
+    return f"{channel_name}/{name}" if channel_name else name
+
+class VideoLog(MutableMapping[str, Dict]):
+    """SQLite (WAL) store of video metadata with the same mapping API as the old video_log.json dict; every write is committed immediately."""
+
+    def __init__(self, db_file: str) -> None:
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS videos (id TEXT PRIMARY KEY, upload_date TEXT, type TEXT, data TEXT NOT NULL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS videos_upload_date ON videos (upload_date)")
+
+    def __getitem__(self, vid_id: str) -> Dict:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM videos WHERE id = ?", (vid_id,)).fetchone()
+        if row is None:
+            raise KeyError(vid_id)
+        return json.loads(row[0])
+
+    def __setitem__(self, vid_id: str, data: Dict) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO videos (id, upload_date, type, data) VALUES (?, ?, ?, ?)",
+                               (vid_id, data.get('upload_date'), data.get('type'), json.dumps(data, ensure_ascii=False)))
+
+    def __delitem__(self, vid_id: str) -> None:
+        with self._lock, self._conn:
+            if self._conn.execute("DELETE FROM videos WHERE id = ?", (vid_id,)).rowcount == 0:
+                raise KeyError(vid_id)
+
+    def __contains__(self, vid_id: object) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM videos WHERE id = ?", (vid_id,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute("SELECT id FROM videos")]
+        return iter(ids)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+
+    def by_upload_date(self, start: str, end: str) -> List[Tuple[str, Dict]]:
+        """Return (id, data) for entries uploaded between start and end (YYYYMMDD, inclusive), oldest first."""
+        with self._lock:
+            rows = self._conn.execute("SELECT id, data FROM videos WHERE upload_date BETWEEN ? AND ? ORDER BY upload_date",
+                                      (start, end)).fetchall()
+        return [(vid_id, json.loads(data)) for vid_id, data in rows]
+
+    def import_json(self, json_file: str) -> int:
+        """Import entries from an old video_log.json file in a single transaction, returning how many were imported."""
+        with open(json_file, 'r', encoding='utf-8') as f:
+            entries = json.load(f)
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO videos (id, upload_date, type, data) VALUES (?, ?, ?, ?)",
+                                   [(vid_id, data.get('upload_date'), data.get('type'), json.dumps(data, ensure_ascii=False))
+                                    for vid_id, data in entries.items()])
+        return len(entries)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class MigrationState:
+    """Durable per-video migration stage, stored next to video_log so an interrupted run can be resumed."""
+
+    STAGES = ('discovered', 'downloaded', 'published', 'reflected', 'cleaned')
+
+    def __init__(self, db_file: str) -> None:
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS migration_state (id TEXT PRIMARY KEY, stage TEXT NOT NULL, "
+                               "video_path TEXT, claim_id TEXT, sd_hash TEXT, updated_at REAL)")
+
+    def get(self, vid_id: str) -> Optional[Dict]:
+        """Return the stored stage and details for a video, or None if it was never seen."""
+        with self._lock:
+            row = self._conn.execute("SELECT stage, video_path, claim_id, sd_hash FROM migration_state WHERE id = ?",
+                                     (vid_id,)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('stage', 'video_path', 'claim_id', 'sd_hash'), row))
+
+    def set_stage(self, vid_id: str, stage: str, video_path: Optional[str] = None, claim_id: Optional[str] = None,
+                  sd_hash: Optional[str] = None) -> None:
+        """Record that a video reached a stage; details not given keep their stored values."""
+        if stage not in self.STAGES:
+            raise ValueError(f"Unknown migration stage: {stage}")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO migration_state (id, stage, video_path, claim_id, sd_hash, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET stage = excluded.stage, "
+                "video_path = COALESCE(excluded.video_path, video_path), claim_id = COALESCE(excluded.claim_id, claim_id), "
+                "sd_hash = COALESCE(excluded.sd_hash, sd_hash), updated_at = excluded.updated_at",
+                (vid_id, stage, video_path, claim_id, sd_hash, time.time()))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class DownloadCache:
+    """Finished downloads kept in the temp folder across runs, keyed by video id and format and evicted least recently used first once over max_bytes."""
+
+    def __init__(self, db_file: str, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._in_use: Set[str] = set()  # Ids being processed or published right now, which evict() never deletes
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS download_cache (id TEXT NOT NULL, format_id TEXT NOT NULL, "
+                               "path TEXT NOT NULL, size INTEGER NOT NULL, media TEXT, last_used REAL NOT NULL, "
+                               "PRIMARY KEY (id, format_id))")
+
+    def get(self, vid_id: str) -> Optional[Dict]:
+        """Return the most recently used cached download of a video and mark it used and in use, or None if there is none on disk."""
+        with self._lock, self._conn:
+            rows = self._conn.execute("SELECT format_id, path, media FROM download_cache WHERE id = ? ORDER BY last_used DESC",
+                                      (vid_id,)).fetchall()
+            for format_id, path, media in rows:
+                if not os.path.isfile(path):
+                    self._conn.execute("DELETE FROM download_cache WHERE id = ? AND format_id = ?", (vid_id, format_id))
+                    continue
+                self._conn.execute("UPDATE download_cache SET last_used = ? WHERE id = ? AND format_id = ?",
+                                   (time.time(), vid_id, format_id))
+                self._in_use.add(vid_id)
+                return {'path': path, 'format_id': format_id, 'media': json.loads(media) if media else None}
+        return None
+
+    def put(self, vid_id: str, format_id: str, path: str, media: Optional[Dict]) -> None:
+        """Add a finished download that is about to be published, then evict older entries until the cache fits in max_bytes again.
+
+        The download stays in use, and can't be evicted, until release() or discard().
+        """
+        with self._lock, self._conn:
+            self._in_use.add(vid_id)
+            self._conn.execute(
+                "INSERT INTO download_cache (id, format_id, path, size, media, last_used) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id, format_id) DO UPDATE SET path = excluded.path, size = excluded.size, "
+                "media = excluded.media, last_used = excluded.last_used",
+                (vid_id, format_id, path, os.path.getsize(path), json.dumps(media) if media else None, time.time()))
+        self.evict()
+
+    def release(self, vid_id: str) -> None:
+        """Let a video's cached download be evicted again once it is no longer being published."""
+        with self._lock:
+            self._in_use.discard(vid_id)
+
+    def discard(self, vid_id: str) -> None:
+        """Forget every cached download of a video; its files are left to delete_video_files."""
+        with self._lock, self._conn:
+            self._in_use.discard(vid_id)
+            self._conn.execute("DELETE FROM download_cache WHERE id = ?", (vid_id,))
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM download_cache").fetchone()[0]
+
+    def evict(self) -> None:
+        """Delete least recently used downloads (and their leftover partial files) until the cache is within max_bytes, skipping those in use."""
+        with self._lock, self._conn:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM download_cache").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = self._conn.execute("SELECT id, format_id, path, size FROM download_cache ORDER BY last_used").fetchall()
+            for vid_id, format_id, path, size in rows:
+                if total <= self.max_bytes:
+                    break
+                if vid_id in self._in_use:
+                    continue
+                for file_path in [path] + glob.glob(os.path.join(os.path.dirname(path), f"{vid_id}*.part")):
+                    try:
+                        os.remove(file_path)
+                    except FileNotFoundError:
+                        pass
+                    except OSError as e:
+                        log_event(f"Failed to evict cached file {file_path}: {e}", level=logging.WARNING, stage='cache', error=str(e))
+                self._conn.execute("DELETE FROM download_cache WHERE id = ? AND format_id = ?", (vid_id, format_id))
+                total -= size
+                log_event(f"Evicted cached download {path} ({size} bytes); cache now {total} of {self.max_bytes} bytes", stage='cache')
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class JobQueue:
+    """Queue of videos to migrate shared by a coordinator and its workers, in a SQLite file on a volume all of them can reach.
+
+    Workers lease a job for a limited time and renew the lease while they work on it, so the job goes back to the
+    queue if a worker dies. The file uses SQLite's default rollback journal, since WAL doesn't work on network shares.
+    """
+
+    def __init__(self, db_file: str, max_attempts: int = 3) -> None:
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, timeout=60, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, upload_date TEXT, info TEXT NOT NULL, "
+                               "status TEXT NOT NULL, worker TEXT, lease_expires REAL, attempts INTEGER NOT NULL DEFAULT 0, "
+                               "updated_at REAL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, upload_date)")
+
+    def enqueue(self, videos: Iterable[Tuple[str, Dict]]) -> int:
+        """Add videos as pending jobs, leaving jobs that are already queued, running or done untouched; returns how many were added."""
+        added = 0
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for vid_id, info in videos:
+                    cursor = self._conn.execute(
+                        "INSERT OR IGNORE INTO jobs (id, upload_date, info, status, updated_at) VALUES (?, ?, ?, 'pending', ?)",
+                        (vid_id, info.get('upload_date'), json.dumps(info, ensure_ascii=False), time.time()))
+                    added += cursor.rowcount
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return added
+
+    def _fail_exhausted(self, now: float) -> None:
+        """Mark jobs whose last attempt's lease expired as failed; nothing would ever lease or finish them again."""
+        self._conn.execute("UPDATE jobs SET status = 'failed', lease_expires = NULL, updated_at = ? "
+                           "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?", (now, now, self.max_attempts))
+
+    def lease(self, worker: str, lease_seconds: float) -> Optional[Tuple[str, Dict]]:
+        """Take the oldest pending job, or one whose lease expired, for lease_seconds; None if nothing is available right now."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")  # Locks out other workers between the select and the update
+            try:
+                self._fail_exhausted(now)
+                row = self._conn.execute(
+                    "SELECT id, info FROM jobs WHERE (status = 'pending' OR (status = 'leased' AND lease_expires < ?)) "
+                    "AND attempts < ? ORDER BY upload_date, id LIMIT 1", (now, self.max_attempts)).fetchone()
+                if row:
+                    self._conn.execute("UPDATE jobs SET status = 'leased', worker = ?, lease_expires = ?, "
+                                       "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                                       (worker, now + lease_seconds, now, row[0]))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return (row[0], json.loads(row[1])) if row else None
+
+    def renew(self, vid_id: str, worker: str, lease_seconds: float) -> bool:
+        """Extend a lease the worker still holds; False if it expired and was given to another worker."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute("UPDATE jobs SET lease_expires = ?, updated_at = ? "
+                                        "WHERE id = ? AND worker = ? AND status = 'leased'",
+                                        (now + lease_seconds, now, vid_id, worker))
+        return cursor.rowcount > 0
+
+    def complete(self, vid_id: str, worker: str, success: bool) -> None:
+        """Finish a leased job; a failed one goes back to pending until it has used up max_attempts."""
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET status = CASE WHEN ? THEN 'done' WHEN attempts < ? THEN 'pending' "
+                               "ELSE 'failed' END, lease_expires = NULL, updated_at = ? WHERE id = ? AND worker = ?",
+                               (success, self.max_attempts, time.time(), vid_id, worker))
+
+    def counts(self) -> Dict[str, int]:
+        """Count jobs by status; expired leases still count as leased unless they were the job's last attempt."""
+        with self._lock:
+            self._fail_exhausted(time.time())
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def largest_bid(self) -> Optional[str]:
+        """Highest bid among the jobs still to be published, or None if there are none."""
+        with self._lock:
+            rows = self._conn.execute("SELECT info FROM jobs WHERE status IN ('pending', 'leased')").fetchall()
+        bids = [str(json.loads(info).get('bid', ODYSEE_BID)) for info, in rows]
+        return max(bids, key=float) if bids else None
+
+    def has_unfinished(self) -> bool:
+        """Check if any job could still be leased now or later (pending, or leased and not out of attempts)."""
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM jobs WHERE status IN ('pending', 'leased') AND attempts < ? LIMIT 1",
+                                     (self.max_attempts,)).fetchone()
+        return row is not None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls evenly so all callers together make at most `rate` calls per second."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def acquire(self) -> None:
+        """Block until the caller may make its next request."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def record_success(self) -> None:
+        """Note that a paced request succeeded; a fixed limiter ignores it."""
+
+    def record_throttle(self, reason: str) -> None:
+        """Note that YouTube throttled a paced request; a fixed limiter ignores it."""
+
+class AdaptiveRateLimiter(RateLimiter):
+    """RateLimiter that speeds up while requests succeed and halves its rate when YouTube throttles (AIMD), remembering the rate between runs."""
+
+    def __init__(self, rate: float, max_rate: float, state_file: Optional[str] = None,
+                 min_rate: float = 0.02, increase: float = 0.02, decrease: float = 0.5, cooldown: float = 10.0) -> None:
+        self.rate = rate
+        self.max_rate = max(max_rate, min_rate)
+        self.min_rate = min_rate
+        self.increase = increase  # Requests per second added after each success
+        self.decrease = decrease  # Factor the rate is multiplied by when throttled
+        self.cooldown = cooldown  # Minimum pause before the next request after being throttled
+        self.state_file = state_file
+        self.successes = 0
+        self.throttles = 0
+        self._decreased_at = float('-inf')  # When the rate was last cut, so one burst of throttles only cuts it once
+        self._save_lock = threading.Lock()
+        if state_file and os.path.isfile(state_file):
+            try:
+                with open(state_file, 'r', encoding='utf-8') as f:
+                    self.rate = float(json.load(f)['rate'])
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+        self.rate = min(max(self.rate, self.min_rate), self.max_rate)
+        super().__init__(self.rate)
+        log_event(f"YouTube request pacing starts at {self.rate:.3f} requests/second (max {self.max_rate:.3f})", stage='pacing')
+
+    def record_success(self) -> None:
+        """Raise the rate by one step, up to max_rate."""
+        with self._lock:
+            self.successes += 1
+            self.rate = min(self.max_rate, self.rate + self.increase)
+            self.interval = 1.0 / self.rate
+            report = self.successes % 25 == 0
+        if report:
+            log_event(f"YouTube request pacing: {self.rate:.3f} requests/second after {self.successes} successful "
+                      f"requests, {self.throttles} throttled", stage='pacing')
+
+    def record_throttle(self, reason: str) -> None:
+        """Cut the rate by the decrease factor, at most once per cooldown, and hold every caller back for at least the cooldown.
+
+        Requests already in flight when YouTube starts throttling fail together; they count as one throttle, not one each.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.throttles += 1
+            decreased = now - self._decreased_at >= self.cooldown
+            if decreased:
+                self._decreased_at = now
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self.interval = 1.0 / self.rate
+            self._next_time = max(self._next_time, now + max(self.interval, self.cooldown))
+        if not decreased:
+            log_event(f"YouTube throttled a request ({reason[:200]}); already paced down to {self.rate:.3f} requests/second",
+                      level=logging.DEBUG, stage='pacing', rate=self.rate, error=reason[:200])
+            return
+        log_event(f"YouTube throttled a request ({reason[:200]}); pacing down to {self.rate:.3f} requests/second",
+                  level=logging.WARNING, stage='pacing', rate=self.rate, error=reason[:200])
+        self.save()
+
+    def save(self) -> None:
+        """Write the current rate to the state file so the next run starts from it; a failed write is only logged."""
+        if not self.state_file:
+            return
+        with self._lock:
+            state = {'rate': self.rate, 'updated_at': datetime.datetime.now().isoformat(timespec='seconds')}
+        tmp_file = f"{self.state_file}.tmp"
+        try:
+            with self._save_lock:  # Callers in every thread share the one tmp file
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(state, f, indent=4)
+                os.replace(tmp_file, self.state_file)
+        except OSError as e:
+            log_event(f"Failed to save YouTube request pacing to {self.state_file}: {e}", level=logging.WARNING,
+                      stage='pacing', error=str(e))
+
+# Error text yt-dlp reports when YouTube rate limits or challenges a client
+THROTTLE_MARKERS = ('http error 429', 'too many requests', 'sign in to confirm', 'rate-limit', 'rate limit',
+                    'try again later')
+
+def is_throttle_error(error: BaseException) -> bool:
+    """Check if a yt-dlp error means YouTube is throttling requests rather than that the video itself failed."""
+    message = str(error).lower()
+    return any(marker in message for marker in THROTTLE_MARKERS)
+
+# Prefer H.264/AAC streams, which only need a stream copy into MP4, before falling back to anything up to 1080p
+DOWNLOAD_FORMAT = ('bv*[vcodec^=avc1][height<=1080][fps>=30]+ba[acodec^=mp4a]/bv*[vcodec^=avc1][height<=1080]+ba[acodec^=mp4a]/'
+                   'best[vcodec^=avc1][acodec^=mp4a][height<=1080]/'
+                   'bv*[height<=1080][fps>=30]+ba/best[height<=1080][fps>=30]/best[height<=1080]')
+
+# Match filter for each entry type's channel tab, compiled once; an entry passes if any filter in its list matches
+TAB_MATCH_FILTERS: Dict[str, Callable] = {
+    'video': yt_dlp.utils.match_filter_func(['live_status!=is_live & original_url!~=shorts']),
+    'livestream': yt_dlp.utils.match_filter_func(['live_status=is_live', 'live_status=was_live', 'live_status=post_live']),
+    'short': yt_dlp.utils.match_filter_func(['original_url~=shorts']),
+}
+
+class YoutubeSession:
+    """Long-lived YoutubeDL instances for the whole run, one per thread and option set, sharing one cookie jar.
+
+    Also hands the full info dict fetched while enriching a video on to its download, as long as it is recent enough
+    that the format URLs in it haven't expired.
+    """
+
+    def __init__(self, cookies: Optional[str], verbose: bool, info_cache_size: int = 32,
+                 info_max_age: float = 1800.0) -> None:
+        self.verbose = verbose
+        self.base_opts: Dict = {
+            'extractor_args': {
+                'youtube': ['formats=missing_pot']  # Enable broken/missing URL formats
+            },
+        }
+        if cookies:
+            self.base_opts['cookiefile'] = cookies
+        self.info_cache_size = info_cache_size
+        self.info_max_age = info_max_age
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._clients: List[yt_dlp.YoutubeDL] = []
+        self._cookiejar = None
+        self._infos: 'OrderedDict[str, Tuple[float, Dict]]' = OrderedDict()
+
+    def client(self, name: str, opts: Dict) -> yt_dlp.YoutubeDL:
+        """Get the calling thread's YoutubeDL for an option set, creating it on first use; opts must not change for a name."""
+        clients = self._local.__dict__.setdefault('clients', {})
+        ydl = clients.get(name)
+        if ydl is None:
+            ydl = yt_dlp.YoutubeDL({**self.base_opts, **opts})
+            with self._lock:
+                if self._cookiejar is None:
+                    self._cookiejar = ydl.cookiejar  # Loads cookiefile once for the whole run
+                else:
+                    ydl.__dict__['cookiejar'] = self._cookiejar  # Seed yt-dlp's cached property with the shared jar
+                self._clients.append(ydl)
+            clients[name] = ydl
+        return ydl
+
+    def metadata_client(self) -> yt_dlp.YoutubeDL:
+        """YoutubeDL for fetching full video info."""
+        return self.client('metadata', {'quiet': not self.verbose, 'no_warnings': not self.verbose, 'verbose': self.verbose})
+
+    def download_client(self, temp_folder: str, remux: bool) -> yt_dlp.YoutubeDL:
+        """YoutubeDL that downloads into temp_folder, remuxing to MP4 or merging into MKV for a later conversion."""
+        opts: Dict = {
+            'format': DOWNLOAD_FORMAT,
+            'outtmpl': {'default': os.path.join(temp_folder, '%(id)s.%(ext)s')},
+            'quiet': False,  # Show progress
+        }
+        if remux:
+            opts['merge_output_format'] = 'mp4'
+            opts['postprocessors'] = [{'key': 'FFmpegVideoRemuxer', 'preferedformat': 'mp4'}]
+            opts['postprocessor_args'] = {'merger': ['-movflags', '+faststart'], 'videoremuxer': ['-movflags', '+faststart']}
+        else:
+            opts['merge_output_format'] = 'mkv'  # Any codec pair can be merged
+        return self.client(f"download-{'remux' if remux else 'merge'}:{temp_folder}", opts)
+
+    def remember(self, vid_id: str, info: Dict) -> None:
+        """Keep a freshly fetched full info dict for the video's download, dropping the oldest beyond info_cache_size."""
+        with self._lock:
+            self._infos[vid_id] = (time.monotonic(), info)
+            self._infos.move_to_end(vid_id)
+            while len(self._infos) > self.info_cache_size:
+                self._infos.popitem(last=False)
+
+    def recall(self, vid_id: str) -> Optional[Dict]:
+        """Take the remembered full info for a video, or None if there is none or it is too old to download from."""
+        with self._lock:
+            fetched, info = self._infos.pop(vid_id, (0.0, None))
+        return info if info is not None and time.monotonic() - fetched < self.info_max_age else None
+
+    def close(self) -> None:
+        """Close every YoutubeDL, saving the shared cookie jar back to the cookie file."""
+        with self._lock:
+            clients, self._clients = self._clients, []
+            self._infos.clear()
+        for ydl in clients:
+            ydl.close()
+
+# Fields of a full info dict kept for match filters and video_log entries
+VIDEO_INFO_FIELDS = ('title', 'upload_date', 'duration', 'description', 'thumbnail', 'tags', 'live_status', 'was_live',
+                     'availability', 'age_limit', 'view_count')
+
+def fetch_video_info(vid_id: str, session: YoutubeSession, rate_limiter: RateLimiter) -> Optional[Dict]:
+    """Fetch full metadata for a single video, keeping only VIDEO_INFO_FIELDS; None if the fetch fails."""
+    started = time.monotonic()
+    for attempt in range(3):
+        rate_limiter.acquire()
+        try:
+            full_info = session.metadata_client().extract_info(f"https://www.youtube.com/watch?v={vid_id}", download=False)
+            rate_limiter.record_success()
+            session.remember(vid_id, full_info)
+            break
+        except Exception as e:
+            if is_throttle_error(e) and attempt < 2:
+                rate_limiter.record_throttle(str(e))
+                continue  # acquire() waits out the back-off before the retry
+            if is_throttle_error(e):
+                rate_limiter.record_throttle(str(e))
+            log_event(f"Failed to fetch full info for {vid_id}: {e}", level=logging.WARNING, stage='enrich', vid_id=vid_id,
+                      duration=time.monotonic() - started, error=str(e))
+            return None
+    # One event per video would flood the log on big channels, so this only reaches the stage metrics
+    log_event(f"Fetched full info for {vid_id}", level=logging.DEBUG, stage='enrich', vid_id=vid_id,
+              duration=time.monotonic() - started)
+    return {key: full_info[key] for key in VIDEO_INFO_FIELDS if key in full_info}
+
+def build_video_entry(vid_id: str, full_info: Dict, entry_url: str, match_filter: Optional[Callable],
+                      channel_url: Optional[str] = None) -> Optional[Dict]:
+    """Apply a tab's filters to fetched info and build its video_log entry; None if it doesn't match the filters."""
+    # The tab's own URL for the entry decides shorts detection, not whichever tab fetched the info first
+    full_info = {**full_info, 'original_url': entry_url}
+
+    # Apply the tab's match filter here since it isn't applied on individual extracts
+    if match_filter and match_filter(full_info, incomplete=False) is not None:
+        return None
+
+    upload_str = full_info.get('upload_date')
+    if not upload_str:
+        log_event(f"No upload_date for video {vid_id}; skipping.", stage='discover', vid_id=vid_id)
+        return None
+
+    return {
+        'title': full_info.get('title', 'Untitled'),
+        'upload_date': upload_str,
+        'duration': format_duration(full_info.get('duration', 0)),
+        'description': full_info.get('description', ''),
+        'type': determine_type(full_info),
+        'thumbnail': full_info.get('thumbnail', ''),
+        'tags': full_info.get('tags', []),
+        'channel_url': channel_url or full_info.get('channel_url', '')
+    }
+
+class SharedEnrichment:
+    """Full-info lookups shared by tab extractions running at the same time, so an id listed under several tabs is fetched once.
+
+    The lookups run on one pool of `workers` threads for the whole run, so each thread's metadata client is reused by every tab.
+    Each channel has its own queue and the threads take from the queues in turn, so a big channel can't hold up the rest.
+    """
+
+    TYPE_PRECEDENCE = ('short', 'livestream', 'video')  # The order determine_type checks in
+
+    def __init__(self, session: YoutubeSession, rate_limiter: RateLimiter, workers: int = 4) -> None:
+        self.session = session
+        self.rate_limiter = rate_limiter
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._lookups: Dict[str, concurrent.futures.Future] = {}
+        self._types: Dict[str, str] = {}
+        self._queues: 'OrderedDict[str, Deque[Tuple[str, concurrent.futures.Future]]]' = OrderedDict()  # channel -> lookups
+        self._closed = False
+        self._threads = [threading.Thread(target=self._work, name=f"enrich-{i}", daemon=True) for i in range(max(1, workers))]
+        for thread in self._threads:
+            thread.start()
+
+    def seen(self, vid_id: str) -> bool:
+        """Check if the id was already looked up by any tab during this run."""
+        with self._lock:
+            return vid_id in self._lookups
+
+    def lookup(self, vid_id: str, channel: str = '') -> concurrent.futures.Future:
+        """Return the future for an id's full info, queueing the fetch under the channel only if no tab has yet."""
+        with self._lock:
+            future = self._lookups.get(vid_id)
+            if future is None or future.cancelled():
+                future = concurrent.futures.Future()
+                self._lookups[vid_id] = future
+                self._queues.setdefault(channel, deque()).append((vid_id, future))
+                self._ready.notify()
+            return future
+
+    def _work(self) -> None:
+        while True:
+            with self._ready:
+                job = None
+                while job is None:
+                    while not self._queues and not self._closed:
+                        self._ready.wait()
+                    if not self._queues:
+                        return
+                    channel, jobs = self._queues.popitem(last=False)
+                    vid_id, future = jobs.popleft()
+                    if jobs:
+                        self._queues[channel] = jobs  # Back of the line, after every other channel's next lookup
+                    if future.set_running_or_notify_cancel():
+                        job = (vid_id, future)
+            try:
+                future.set_result(fetch_video_info(vid_id, self.session, self.rate_limiter))
+            except Exception as e:
+                future.set_exception(e)
+
+    def cancel(self, future: concurrent.futures.Future) -> bool:
+        """Cancel a lookup that hasn't started yet; a tab still waiting on it will resubmit it."""
+        return future.cancel()
+
+    def record(self, video_log: MutableMapping[str, Dict], vid_id: str, data: Dict) -> Dict:
+        """Store an entry in video_log; if several tabs listed the id, the type determine_type checks first wins."""
+        with self._lock:
+            previous = self._types.get(vid_id)
+            if previous and self.TYPE_PRECEDENCE.index(previous) < self.TYPE_PRECEDENCE.index(data['type']):
+                data = {**data, 'type': previous}
+            self._types[vid_id] = data['type']
+            video_log[vid_id] = data
+        return data
+
+    def close(self) -> None:
+        """Stop the lookup threads once every tab is done."""
+        with self._ready:
+            self._closed = True
+            self._ready.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+def cached_entries_between(video_log: MutableMapping[str, Dict], start_date: datetime.date,
+                           end_date: datetime.date) -> List[Tuple[str, Dict]]:
+    """Return video_log entries uploaded within the date range, using the upload_date index when available."""
+    start, end = start_date.strftime('%Y%m%d'), end_date.strftime('%Y%m%d')
+    if isinstance(video_log, VideoLog):
+        return video_log.by_upload_date(start, end)
+    return [(vid_id, data) for vid_id, data in video_log.items() if start <= data.get('upload_date', '') <= end]
+
+def iter_flat_entries(url: str, ydl_opts: Dict, rate_limiter: Optional[RateLimiter] = None,
+                      session: Optional[YoutubeSession] = None) -> Iterator[Dict]:
+    """Stream a channel tab's flat playlist entries as yt-dlp pages through them, keeping only the fields needed per entry."""
+    try:
+        # A session's client shares its cookie jar and stays open for the rest of the run
+        with contextlib.nullcontext(session.client(f"flat:{url}", ydl_opts)) if session else yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            if ydl_opts.get('playlist_items'):
+                info = ydl.extract_info(url, download=False)  # Let yt-dlp apply the item range itself
+            else:
+                # process=False leaves 'entries' as the extractor's lazy generator instead of a fully fetched list
+                info = ydl.extract_info(url, download=False, process=False)
+                if info.get('_type') in ('url', 'url_transparent'):
+                    info = ydl.extract_info(info['url'], download=False, process=False)
+            for entry in info.get('entries') or []:
+                # Apply the match filter yt-dlp would have applied to the flat entry while processing the playlist
+                if entry and ydl._match_entry(entry, incomplete=True) is not None:
+                    continue
+                yield {key: entry[key] for key in ('id', 'title', 'url') if key in entry} if entry else entry
+    except Exception as e:
+        if rate_limiter and is_throttle_error(e):
+            rate_limiter.record_throttle(str(e))
+        log_event(f"Extraction failed for {url}: {e}", level=logging.WARNING, stage='discover', error=str(e))
+        print(f"Extraction error: {e}. Check migration_log.txt for details.")
+
 def extract_youtube_content(channel_url: str, content_type: str, start_date: datetime.date, end_date: datetime.date,
-                            cookies: Optional[str], verbose: bool, log_file: str, video_log: Dict[str, Dict]) -> Dict[str, Dict]:
+                            cookies: Optional[str], verbose: bool, video_log: MutableMapping[str, Dict],
+                            workers: int = 1, rate_limiter: Optional[RateLimiter] = None,
+                            incremental: bool = False, shared: Optional[SharedEnrichment] = None) -> Dict[str, Dict]:
     """Extract and filter YouTube videos, livestreams, or shorts using yt-dlp with date and content filters, using video_log for caching."""
+    if rate_limiter is None:
+        rate_limiter = RateLimiter(0.2)
+    own_session = shared is None
+    if shared is None:
+        shared = SharedEnrichment(YoutubeSession(cookies, verbose), rate_limiter, workers)
     if content_type.lower() == 'videos':
         tab = '/videos'
-        match_filters = ['live_status!=is_live & !original_url~=shorts']
+        entry_type = 'video'
     elif content_type.lower() == 'livestreams':
         tab = '/streams'
-        match_filters = ['live_status=is_live|was_live|post_live']
+        entry_type = 'livestream'
     else:  # shorts
         tab = '/shorts'
-        match_filters = ['original_url~=shorts']
+        entry_type = 'short'
+    match_filter = TAB_MATCH_FILTERS[entry_type]
 
     url = f"{channel_url}{tab}"
 
@@ -70,88 +1028,76 @@ def extract_youtube_content(channel_url: str, content_type: str, start_date: dat
         'extract_flat': True,  # Fetch minimal metadata initially to optimize
         'no_warnings': not verbose,
         'verbose': verbose,
-        'dateafter': start_date.strftime('%Y%m%d'),
-        'datebefore': end_date.strftime('%Y%m%d'),
-        'match_filters': match_filters,
-        'sleep_interval': 5,  # Sleep 5-30s between requests
-        'max_sleep_interval': 30,
-        'sleep_requests': 1,  # Sleep 1s before each API call
-        'retry_sleep': 10,  # Sleep 10s before retrying on rate limit errors
+        'match_filter': match_filter,  # Upload dates are checked below, where the newest-first order can end the scan
+        'sleep_interval_requests': rate_limiter.interval,  # Pace the channel's playlist pages like the metadata lookups
         # 'playlist_items': '1-100',  # Limit to first 100 items; adjust or remove for full fetch
     }
-    if cookies:
-        ydl_opts['cookiefile'] = cookies
 
-    try:
-        with open(log_file, 'a', encoding='utf-8') as log:
-            log.write(f"Fetching {content_type} from {url}\n")
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            entries = info.get('entries', [])
-    except Exception as e:
-        with open(log_file, 'a', encoding='utf-8') as log:
-            log.write(f"Extraction failed for {url}: {e}\n")
-        print(f"Extraction error: {e}. Check {log_file} for details.")
-        return {}
-
-    if not entries:
-        with open(log_file, 'a', encoding='utf-8') as log:
-            log.write(f"No entries found for {url} with content_type={content_type}, date range {start_date} to {end_date}. Verify channel URL, content visibility, or use --cookies if private.\n")
-        print("No videos found. Enable --verbose for more details or check migration_log.txt.")
-        return {}
+    log_event(f"Fetching {content_type} from {url}{' (incremental)' if incremental else ''}", stage='discover')
+    entries_seen = 0
+    stop_scan = False
 
+    required_keys = ['title', 'upload_date', 'duration', 'description', 'type', 'thumbnail', 'tags']
     video_dict: Dict[str, Dict] = {}
-    for entry in entries:
-        if not entry or 'id' not in entry:
-            with open(log_file, 'a', encoding='utf-8') as log:
-                try:
-                    log.write(f"Skipping invalid entry (id: {entry.get('id', 'unknown')}, title: {entry.get('title', 'unknown')[:50]})\n")
-                except UnicodeEncodeError:
-                    log.write(f"Skipping invalid entry (id: {entry.get('id', 'unknown')}, title: <unencodable>)\n")
-            continue
+    # Missing entries are enriched by the shared lookup pool under rate_limiter, but results are consumed in channel order
+    # (newest first) so the start_date cut-off below still ends the scan early. workers sets how far ahead this tab looks.
+    # Each pending item is (vid_id, entry url, cached data or a future for the full info).
+    pending: Deque[Tuple[str, str, object]] = deque()
+    lookahead = max(1, workers) * 4
+    entry_iter = iter_flat_entries(url, ydl_opts, rate_limiter, shared.session)
 
-        vid_id = entry['id']
-        required_keys = ['title', 'upload_date', 'duration', 'description', 'type', 'thumbnail', 'tags']
-        if vid_id in video_log and all(k in video_log[vid_id] for k in required_keys):
-            data = video_log[vid_id]
-        else:
-            ydl_full_opts = {
-                'quiet': not verbose,
-                'no_warnings': not verbose,
-                'verbose': verbose,
-            }
-            if cookies:
-                ydl_full_opts['cookiefile'] = cookies
-            with yt_dlp.YoutubeDL(ydl_full_opts) as ydl_full:
-                try:
-                    full_info = ydl_full.extract_info(f"https://www.youtube.com/watch?v={vid_id}", download=False)
-                except Exception as e:
-                    with open(log_file, 'a', encoding='utf-8') as log:
-                        log.write(f"Failed to fetch full info for {vid_id}: {e}\n")
-                    continue
+    def fill_pending() -> None:
+        nonlocal entries_seen, stop_scan
+        while len(pending) < lookahead and not stop_scan:
+            try:
+                entry = next(entry_iter)
+            except StopIteration:
+                return
+            entries_seen += 1
+            if not entry or 'id' not in entry:
+                entry = entry or {}
+                # The log files are UTF-8, so any title can be written as it is
+                log_event(f"Skipping invalid entry (id: {entry.get('id', 'unknown')}, title: {(entry.get('title') or 'unknown')[:50]})",
+                          stage='discover', vid_id=entry.get('id'))
+                continue
+            vid_id = entry['id']
+            entry_url = entry.get('url') or f"https://www.youtube.com/watch?v={vid_id}"
+            # Ids another tab looked up during this run go through the shared lookup, so their type is resolved
+            # the same way however the tabs interleave
+            # One read per entry: with a VideoLog every lookup is a query plus a JSON decode of the whole row
+            cached = None if shared.seen(vid_id) else video_log.get(vid_id)
+            if cached is not None and all(k in cached for k in required_keys):
+                if incremental:
+                    # Everything from here on was synced by an earlier run; the cached entries are merged below
+                    stop_scan = True
+                    return
+                pending.append((vid_id, entry_url, cached))
+            else:
+                pending.append((vid_id, entry_url, shared.lookup(vid_id, channel_url)))
 
-            # Apply match_filter manually since it's not applied on individual extract
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl_matcher:
-                if ydl_matcher._match_entry(full_info, incomplete=False) is not None:
-                    continue
+    def lookup_result(vid_id: str, entry_url: str, future: concurrent.futures.Future) -> Optional[Dict]:
+        while True:
+            try:
+                full_info = future.result()
+                break
+            except concurrent.futures.CancelledError:
+                future = shared.lookup(vid_id, channel_url)  # Another tab dropped it past its own cut-off
+        if full_info is None:
+            return None
+        data = build_video_entry(vid_id, full_info, entry_url, match_filter, channel_url)
+        return shared.record(video_log, vid_id, data) if data else None
 
-            upload_str = full_info.get('upload_date')
-            if not upload_str:
-                with open(log_file, 'a', encoding='utf-8') as log:
-                    log.write(f"No upload_date for video {vid_id}; skipping.\n")
+    fill_pending()
+    while pending:
+        vid_id, entry_url, item = pending.popleft()
+        if isinstance(item, concurrent.futures.Future):
+            data = lookup_result(vid_id, entry_url, item)
+            if data is None:
+                fill_pending()
                 continue
-
-            data = {
-                'title': full_info.get('title', 'Untitled'),
-                'upload_date': upload_str,
-                'duration': format_duration(full_info.get('duration', 0)),
-                'description': full_info.get('description', ''),
-                'type': determine_type(full_info),
-                'thumbnail': full_info.get('thumbnail', ''),
-                'tags': full_info.get('tags', [])
-            }
-            video_log[vid_id] = data
-            time.sleep(5)  # Avoid rate limits
+        else:
+            data = item
+        fill_pending()
 
         # Check date range
         upload_str = data.get('upload_date')
@@ -166,181 +1112,649 @@ def extract_youtube_content(channel_url: str, content_type: str, start_date: dat
                 break  # Entries are newest first
             video_dict[vid_id] = data
 
+    # Past the cut-off: drop queued lookups, but keep any that already ran so the next run can use them
+    for vid_id, entry_url, item in pending:
+        if isinstance(item, concurrent.futures.Future) and not shared.cancel(item):
+            lookup_result(vid_id, entry_url, item)
+    entry_iter.close()
+    if own_session:
+        shared.close()
+        shared.session.close()
+
+    if not entries_seen:
+        log_event(f"No entries found for {url} with content_type={content_type}, date range {start_date} to {end_date}. Verify channel URL, content visibility, or use --cookies if private.", stage='discover')
+        print("No videos found. Enable --verbose for more details or check migration_log.txt.")
+    if incremental:
+        log_event(f"Incremental sync of {url}: scanned {entries_seen} entries, found {len(video_dict)} new in range.", stage='discover')
+        for vid_id, data in cached_entries_between(video_log, start_date, end_date):
+            # Entries cached before channels were recorded can only have come from the one configured channel
+            if data.get('type') == entry_type and data.get('channel_url', channel_url) == channel_url:
+                video_dict.setdefault(vid_id, data)
+
     if not video_dict:
-        with open(log_file, 'a', encoding='utf-8') as log:
-            log.write(f"No videos matched the criteria for content_type={content_type}, date range {start_date} to {end_date}.\n")
+        log_event(f"No videos matched the criteria for content_type={content_type}, date range {start_date} to {end_date}.", stage='discover')
         print("No videos matched the criteria. Check migration_log.txt for details.")
 
     return video_dict
 
-def confirm_videos(video_dict: Dict[str, Dict], log_file: str) -> Dict[str, Dict]:
-    """Interactively confirm and remove videos from the dictionary; allow cancel to exit."""
+def parse_duration_value(value: str) -> int:
+    """Parse a duration given as seconds, MM:SS or HH:MM:SS into seconds."""
+    seconds = 0
+    for part in value.split(':'):
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+def parse_selection_filter(text: str) -> Callable[[str, Dict], bool]:
+    """Parse an --include/--exclude filter such as id=ID1,ID2, id=@ids.txt, type=short, duration<600 or date>=01-31-2020
+    into a predicate taking (id, video_log entry)."""
+    match = re.match(r'^\s*(id|type|duration|date)\s*(<=|>=|!=|=|<|>)\s*(.+?)\s*$', text)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid filter: {text} (expected id, type, duration or date, an operator and a value)")
+    key, op, value = match.groups()
+    if key in ('id', 'type'):
+        if op not in ('=', '!='):
+            raise argparse.ArgumentTypeError(f"Invalid filter: {text} ({key} can only be compared with = or !=)")
+        if key == 'id' and value.startswith('@'):
+            # A file of ids, such as the Successful Uploads line copied from migration_log.txt
+            try:
+                with open(value[1:], 'r', encoding='utf-8') as f:
+                    values = set(f.read().replace(',', ' ').split())
+            except OSError as e:
+                raise argparse.ArgumentTypeError(f"Can't read ids for filter {text}: {e}")
+        else:
+            values = {v.strip() for v in value.split(',') if v.strip()}
+        if key == 'type':
+            values = {v[:-1] if v.endswith('s') else v for v in values}  # 'shorts' and 'short' both work
+            if not values <= {'video', 'livestream', 'short'}:
+                raise argparse.ArgumentTypeError(f"Invalid filter: {text} (types are video, livestream and short)")
+        field = (lambda vid_id, info: vid_id) if key == 'id' else (lambda vid_id, info: info.get('type'))
+        return (lambda vid_id, info: field(vid_id, info) in values) if op == '=' else (lambda vid_id, info: field(vid_id, info) not in values)
+
+    try:
+        if key == 'duration':
+            bound = parse_duration_value(value)
+            field = lambda vid_id, info: parse_duration_value(info.get('duration') or '0')
+        else:
+            bound = datetime.datetime.strptime(value, '%m-%d-%Y').strftime('%Y%m%d')
+            field = lambda vid_id, info: info.get('upload_date', '')
+    except ValueError:
+        expected = "seconds, MM:SS or HH:MM:SS" if key == 'duration' else "MM-DD-YYYY"
+        raise argparse.ArgumentTypeError(f"Invalid filter: {text} ({key} must be {expected})")
+    compare = {'=': lambda a, b: a == b, '!=': lambda a, b: a != b, '<': lambda a, b: a < b, '<=': lambda a, b: a <= b,
+               '>': lambda a, b: a > b, '>=': lambda a, b: a >= b}[op]
+    return lambda vid_id, info: compare(field(vid_id, info), bound)
+
+def select_videos(video_dict: Dict[str, Dict], include: Optional[List[Callable]] = None,
+                  exclude: Optional[List[Callable]] = None) -> Dict[str, Dict]:
+    """Keep the videos that match every include filter and none of the exclude filters."""
+    return {vid_id: info for vid_id, info in video_dict.items()
+            if all(keep(vid_id, info) for keep in include or []) and not any(drop(vid_id, info) for drop in exclude or [])}
+
+# Fields listed first on each plan line, so the file can be read (and trimmed) by eye
+PLAN_FIELDS = ('upload_date', 'type', 'duration', 'title', 'odysee_channel', 'bid')
+
+def write_plan(plan_file: str, video_dict: Dict[str, Dict], targets: Dict[str, Tuple[str, str]]) -> None:
+    """Write the selected videos to a JSONL plan, oldest first, one video per line with its Odysee channel and bid."""
+    tmp_file = f"{plan_file}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        for vid_id, info in sorted(video_dict.items(), key=lambda x: x[1]['upload_date']):
+            channel_name, bid = targets[vid_id]
+            record = {'id': vid_id, **{key: info.get(key) for key in PLAN_FIELDS[:4]}, 'odysee_channel': channel_name, 'bid': bid}
+            record.update((key, value) for key, value in info.items() if key not in record)
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    os.replace(tmp_file, plan_file)
+
+def load_plan(plan_file: str) -> Tuple[Dict[str, Dict], Dict[str, Tuple[str, str]]]:
+    """Read a plan written by write_plan, returning its videos and their (Odysee channel, bid); blank lines and lines starting with # are skipped."""
+    required_keys = ['title', 'upload_date', 'duration', 'description', 'type', 'thumbnail', 'tags']
+    video_dict: Dict[str, Dict] = {}
+    targets: Dict[str, Tuple[str, str]] = {}
+    with open(plan_file, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"Line {line_number} of {plan_file} isn't valid JSON: {e}")
+            missing = [key for key in ['id'] + required_keys if key not in record]
+            if missing:
+                raise ValueError(f"Line {line_number} of {plan_file} is missing {', '.join(missing)}.")
+            vid_id = record.pop('id')
+            targets[vid_id] = (record.pop('odysee_channel', ODYSEE_CHANNEL_NAME), str(record.pop('bid', ODYSEE_BID)))
+            video_dict[vid_id] = record
+    return video_dict, targets
+
+def print_video_page(videos: List[Tuple[str, Dict]], page: int, page_size: int) -> None:
+    """Print one page of the candidate videos as a compact table, fitting titles to the terminal width."""
+    pages = max(1, -(-len(videos) // page_size))
+    width = shutil.get_terminal_size((120, 24)).columns
+    title_width = max(20, width - 46)
+    print(f"\n{'#':>6}  {'ID':<11}  {'Date':<10}  {'Type':<10}  {'Length':>8}  Title")
+    for number, (vid_id, info) in enumerate(videos[page * page_size:(page + 1) * page_size], page * page_size + 1):
+        date = info.get('upload_date', '')
+        date = f"{date[:4]}-{date[4:6]}-{date[6:]}" if len(date) == 8 else date
+        title = info.get('title', '')
+        title = title if len(title) <= title_width else title[:title_width - 3] + '...'
+        print(f"{number:>6}  {vid_id:<11}  {date:<10}  {info.get('type', ''):<10}  {info.get('duration', ''):>8}  {title}")
+    counts = {t: sum(1 for _, info in videos if info.get('type') == t) for t in ('video', 'livestream', 'short')}
+    print(f"Page {page + 1} of {pages}; {len(videos)} videos ({counts['video']} videos, {counts['livestream']} livestreams, "
+          f"{counts['short']} shorts)")
+
+def confirm_videos(video_dict: Dict[str, Dict], page_size: int = 25) -> Dict[str, Dict]:
+    """Interactively review the videos a page at a time and remove any; allow cancel to exit."""
+    help_text = ("Press Enter to proceed, 'n'/'p' or a page number to page through, space-separated video IDs to remove, "
+                 "'exclude <filter>' or 'include <filter>' (e.g. exclude type=short), or 'cancel' to exit.")
+    page = 0
     while True:
-        print("\nCurrent videos to migrate:")
-        print(json.dumps(video_dict, indent=4, ensure_ascii=False))
-        user_input = input(f"{len(video_dict.keys())} videos found. Enter space-separated video IDs to remove, 'cancel' to exit, or press Enter to proceed: ").strip()
+        videos = sorted(video_dict.items(), key=lambda x: x[1]['upload_date'])
+        pages = max(1, -(-len(videos) // page_size))
+        page = min(page, pages - 1)
+        print_video_page(videos, page, page_size)
+        user_input = input(f"{help_text}\n> ").strip()
+        command, _, rest = user_input.partition(' ')
         if user_input.lower() == 'cancel':
-            with open(log_file, 'a', encoding='utf-8') as log:
-                log.write("Migration cancelled by user.\n")
+            log_event("Migration cancelled by user.", stage='discover')
             print("Exiting as requested.")
             sys.exit(0)
         if not user_input:
             break
-        ids_to_remove = user_input.split()
-        for vid_id in ids_to_remove:
-            video_dict.pop(vid_id, None)
+        if user_input.lower() in ('n', 'p'):
+            page = max(0, min(pages - 1, page + (1 if user_input.lower() == 'n' else -1)))
+        elif user_input.isdigit():
+            page = max(0, min(pages - 1, int(user_input) - 1))
+        elif command.lower() in ('include', 'exclude') and rest:
+            try:
+                selection_filter = parse_selection_filter(rest)
+            except argparse.ArgumentTypeError as e:
+                print(e)
+                continue
+            before = len(video_dict)
+            video_dict = select_videos(video_dict, **{command.lower(): [selection_filter]})
+            print(f"Removed {before - len(video_dict)} videos.")
+        else:
+            unknown = [vid_id for vid_id in user_input.split() if video_dict.pop(vid_id, None) is None]
+            if unknown:
+                print(f"Not in the list: {' '.join(unknown)}")
     return video_dict
 
+def probe_dimensions(video_path: str) -> Tuple[int, int]:
+    """Get the (width, height) of a video's first video stream using ffprobe, cached by path, size and mtime."""
+    stat = os.stat(video_path)
+    key = (os.path.abspath(video_path), stat.st_size, stat.st_mtime)
+    with _PROBE_CACHE_LOCK:
+        if key in _PROBE_CACHE:
+            return _PROBE_CACHE[key]
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-show_entries', 'stream=width,height',
+         '-of', 'csv=s=x:p=0', video_path],
+        capture_output=True, text=True
+    )
+    width, height = map(int, result.stdout.strip().split('x'))
+    with _PROBE_CACHE_LOCK:
+        _PROBE_CACHE[key] = (width, height)
+    return width, height
+
 def is_vertical_short(video_path: str) -> bool:
     """Check if the video is vertical (short-like) using ffprobe."""
     try:
-        result = subprocess.run(
-            ['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-show_entries', 'stream=width,height',
-             '-of', 'csv=s=x:p=0', video_path],
-            capture_output=True, text=True
-        )
-        width, height = map(int, result.stdout.strip().split('x'))
+        width, height = probe_dimensions(video_path)
         return height > width  # Vertical if height > width
     except Exception as e:
         print(f"Failed to check aspect ratio for {video_path}: {e}")
         return False  # Assume not vertical on error
 
-# def get_audio_stats(video_path: str) -> Optional[Dict[str, float]]:
-#     """Get max and mean audio volume stats using ffmpeg."""
-#     try:
-#         # Run ffmpeg with astats filter to get stats
-#         command = ['ffmpeg', '-i', video_path, '-af', 'astats=metadata=1:reset=1', '-vn', '-f', 'null', '-']
-#         result = subprocess.run(command, stderr=subprocess.PIPE, text=True, check=True)
-#         lines = result.stderr.split('\n')
-#         max_volume = None
-#         mean_volume = None
-#         for line in lines:
-#             if 'Max volume' in line:
-#                 max_volume = float(line.split(':')[1].strip().split(' ')[0])
-#             if 'Mean volume' in line:
-#                 mean_volume = float(line.split(':')[1].strip().split(' ')[0])
-#         if max_volume is None or mean_volume is None:
-#             return None
-#         return {'max': max_volume, 'mean': mean_volume}
-#     except Exception as e:
-#         print(f"Failed to get audio stats for {video_path}: {e}")
-#         return None
-
-# def normalize_audio(video_path: str, temp_folder: str, vid_id: str, log_file: str) -> str:
-#     """Normalize audio if too low by boosting volume to target max ~0 dB."""
-#     stats = get_audio_stats(video_path)
-#     if stats is None:
-#         return video_path  # Skip if stats fail
-#     max_vol = stats['max']
-#     if max_vol >= -5:  # Already above threshold
-#         return video_path
-
-#     # Calculate boost: negative of max_vol to reach 0 dB (with headroom to avoid clipping)
-#     boost_db = -max_vol - 1  # -1 dB headroom
-#     normalized_path = os.path.join(temp_folder, f"{vid_id}_normalized.mp4")
-#     command = ['ffmpeg', '-i', video_path, '-af', f'volume={boost_db}dB', '-c:v', 'copy', '-c:a', 'aac', normalized_path]
-#     try:
-#         result = subprocess.run(command, check=True, capture_output=True, text=True)
-#         with open(log_file, 'a', encoding='utf-8') as log:
-#             log.write(f"Normalized audio for {vid_id}: {result.stdout}\n")
-#         os.remove(video_path)  # Replace original
-#         return normalized_path
-#     except Exception as e:
-#         with open(log_file, 'a', encoding='utf-8') as log:
-#             log.write(f"Audio normalization failed for {video_path}: {str(e)}\n")
-#         return video_path  # Fallback to original
-
-def download_video(video_id: str, temp_folder: str, cookies: Optional[str], log_file: str) -> Optional[str]:
-    """Download video in highest quality using yt-dlp, converting to MP4 if necessary, handling SABR formats, and normalizing audio."""
-    url = f"https://www.youtube.com/watch?v={video_id}"
-    video_path = os.path.join(temp_folder, f"{video_id}.%(ext)s")
+def measure_loudness(video_path: str) -> Optional[Dict[str, float]]:
+    """Measure integrated loudness and true peak of the first audio stream with ffmpeg's loudnorm (audio is decoded, video is not)."""
+    command = ['ffmpeg', '-hide_banner', '-nostats', '-i', video_path, '-map', '0:a:0', '-vn', '-sn', '-dn',
+               '-af', 'loudnorm=print_format=json', '-f', 'null', '-']
+    result = subprocess.run(command, capture_output=True, text=True)
+    match = re.search(r'\{[^{}]*"input_i"[^{}]*\}', result.stderr)
+    if result.returncode != 0 or not match:
+        return None
+    stats = json.loads(match.group(0))
+    try:
+        return {'integrated': float(stats['input_i']), 'true_peak': float(stats['input_tp'])}
+    except (KeyError, ValueError):
+        return None  # e.g. "-inf" for silent audio
 
-    ydl_opts: Dict = {
-        'format': 'best[height<=1080][fps>=30]/best[height<=1080]',
-        'outtmpl': {'default': video_path},
-        'quiet': False,  # Show progress
-        'sleep_interval': 5,
-        'max_sleep_interval': 30,
-        'retry_sleep': 10,
-        'extractor_args': {
-            'youtube': ['formats=missing_pot']  # Enable broken/missing URL formats
-        },
-        'postprocessors': [
-            # Removed FFmpegMerger, as format '+' handles merging
-            {  # Convert to MP4 with H.264 baseline for better iOS compatibility
-                'key': 'FFmpegVideoConvertor',
-                'preferedformat': 'mp4'
-            },
-        ],
+def loudness_gain(stats: Dict[str, float], target: float, max_true_peak: float = -1.0) -> float:
+    """Gain in dB that brings audio to the target loudness without pushing its true peak above max_true_peak."""
+    gain = target - stats['integrated']
+    return min(gain, max_true_peak - stats['true_peak'])
+
+def children_cpu_seconds() -> Optional[float]:
+    """CPU time used so far by finished child processes (ffmpeg/ffprobe), or None where the OS doesn't report it."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+def run_media_job(video_path: str, conversion_args: Optional[List[str]], threads: int,
+                  loudness_target: Optional[float] = None, dimensions: Optional[Tuple[int, int]] = None) -> Dict:
+    """Convert a downloaded file to MP4 if needed, normalise its loudness if asked, and probe its dimensions unless they are already known; runs in a media worker process."""
+    started = time.monotonic()
+    cpu_before = children_cpu_seconds()
+
+    # Loudness is measured from the audio alone; the gain is then applied in the same ffmpeg pass as the conversion,
+    # or in an audio-only re-encode with the video stream copied, so the video is never decoded just for this
+    gain_db = None
+    if loudness_target is not None:
+        stats = measure_loudness(video_path)
+        if stats is not None:
+            gain_db = loudness_gain(stats, loudness_target)
+            if abs(gain_db) < 0.5:
+                gain_db = None  # Close enough; don't re-encode the audio for an inaudible change
+    if gain_db is not None:
+        base_args = conversion_args or ['-c:v', 'copy', '-movflags', '+faststart']
+        # Drop any audio codec choice; normalised audio always has to be re-encoded
+        base_args = [arg for i, arg in enumerate(base_args) if arg != '-c:a' and (i == 0 or base_args[i - 1] != '-c:a')]
+        conversion_args = base_args + ['-af', f'volume={gain_db:.2f}dB', '-c:a', 'aac', '-b:a', '192k']
+
+    if conversion_args:
+        output_path = os.path.splitext(video_path)[0] + '.mp4'
+        if output_path == video_path:
+            output_path = os.path.splitext(video_path)[0] + '.processed.mp4'
+        command = ['ffmpeg', '-y', '-hide_banner', '-loglevel', 'error', '-i', video_path, '-map', '0:v:0', '-map', '0:a:0?',
+                   *conversion_args, '-threads', str(threads), output_path]
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg conversion failed: {result.stderr.strip()[-500:]}")
+        os.remove(video_path)
+        video_path = output_path
+
+    if dimensions:
+        width, height = dimensions
+    else:
+        try:
+            width, height = probe_dimensions(video_path)
+        except Exception:
+            width = height = None
+
+    cpu_after = children_cpu_seconds()
+    return {
+        'path': video_path,
+        'width': width,
+        'height': height,
+        'converted': bool(conversion_args),
+        'probed': not dimensions,
+        'gain_db': gain_db,
+        'bytes': os.path.getsize(video_path),
+        'wall_seconds': time.monotonic() - started,
+        'cpu_seconds': cpu_after - cpu_before if cpu_before is not None and cpu_after is not None else None,
     }
-    if cookies:
-        ydl_opts['cookiefile'] = cookies
 
-    try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            ydl.download([url])
-
-        # Find video file (now always MP4 after postprocessing)
-        actual_video = next((f for f in os.listdir(temp_folder) if f.startswith(video_id) and f.endswith('.mp4')), None)
-        if actual_video:
-            video_path = os.path.join(temp_folder, actual_video)
+class MediaPool:
+    """Process pool for ffmpeg/ffprobe work that caps concurrent media jobs and splits the host's cores between them."""
+
+    def __init__(self, workers: int, loudness_target: Optional[float] = None) -> None:
+        self.workers = workers
+        self.loudness_target = loudness_target
+        self.threads_per_job = max(1, (os.cpu_count() or 1) // max(1, workers))
+        self.executor = self._new_executor() if workers > 0 else None
+
+    def _new_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        # 'spawn' keeps worker processes from inheriting the downloader and reflector threads
+        return concurrent.futures.ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def submit(self, vid_id: str, video_path: str, conversion_args: Optional[List[str]] = None,
+               dimensions: Optional[Tuple[int, int]] = None) -> concurrent.futures.Future:
+        """Queue a media job for a downloaded file; with no workers it runs right away in the calling thread.
+
+        If a worker process died (e.g. killed for running out of memory) the pool is replaced; jobs that were already in
+        it fail on their own, and a job that can't be queued fails alone instead of ending the run.
+        """
+        if self.executor:
+            future = None
+            for attempt in range(2):
+                try:
+                    future = self.executor.submit(run_media_job, video_path, conversion_args, self.threads_per_job,
+                                                  self.loudness_target, dimensions)
+                    break
+                except concurrent.futures.process.BrokenProcessPool as e:
+                    log_event(f"Media worker pool broke ({e}); starting a new one.", level=logging.WARNING, stage='media',
+                              vid_id=vid_id, error=str(e))
+                    self.executor.shutdown(wait=False)
+                    self.executor = self._new_executor()
+                    error: Exception = e
+            if future is None:
+                future = concurrent.futures.Future()
+                future.set_exception(error)
         else:
+            future = concurrent.futures.Future()
+            try:
+                future.set_result(run_media_job(video_path, conversion_args, self.threads_per_job, self.loudness_target,
+                                                dimensions))
+            except Exception as e:
+                future.set_exception(e)
+        future.add_done_callback(lambda f: self._log_job(vid_id, f))
+        return future
+
+    def _log_job(self, vid_id: str, future: concurrent.futures.Future) -> None:
+        if future.cancelled():
+            log_event(f"Media job for {vid_id} was cancelled.", stage='media', vid_id=vid_id)
+        elif future.exception():
+            log_event(f"Media job for {vid_id} failed: {future.exception()}", level=logging.WARNING, stage='media',
+                      vid_id=vid_id, error=str(future.exception()))
+        else:
+            media = future.result()
+            cpu = f"{media['cpu_seconds']:.1f}s CPU" if media['cpu_seconds'] is not None else "CPU time unavailable"
+            actions = [name for name in ('converted', 'probed') if media[name]]
+            action = ' and '.join(actions) or 'checked'
+            if media['gain_db'] is not None:
+                action += f" (audio gain {media['gain_db']:+.1f} dB)"
+            log_event(f"Media job for {vid_id} {action} in {media['wall_seconds']:.1f}s wall, {cpu}.", stage='media',
+                      vid_id=vid_id, duration=media['wall_seconds'], bytes=media['bytes'], cpu_seconds=media['cpu_seconds'],
+                      converted=media['converted'], gain_db=media['gain_db'])
+
+    def close(self) -> None:
+        if self.executor:
+            self.executor.shutdown()
+
+def is_web_video_codec(vcodec: Optional[str]) -> bool:
+    """Check if a video codec can be stored in MP4 and played on the web without re-encoding (H.264)."""
+    return (vcodec or '').lower().startswith(('avc1', 'h264'))
+
+def is_web_audio_codec(acodec: Optional[str]) -> bool:
+    """Check if an audio codec can be stored in MP4 and played on the web without re-encoding (AAC)."""
+    return (acodec or '').lower().startswith(('mp4a', 'aac'))
+
+def get_selected_codecs(info: Dict) -> Tuple[str, str]:
+    """Get the (vcodec, acodec) yt-dlp selected for download, covering both merged and single-file formats."""
+    formats = info.get('requested_formats') or [info]
+    vcodec = next((f['vcodec'] for f in formats if f.get('vcodec') not in (None, 'none')), 'none')
+    acodec = next((f['acodec'] for f in formats if f.get('acodec') not in (None, 'none')), 'none')
+    return vcodec, acodec
+
+def build_media_descriptor(info: Dict) -> Dict:
+    """Describe the format yt-dlp selected (dimensions, duration, codecs, size, fps) so later steps don't need to probe the file."""
+    formats = info.get('requested_formats') or [info]
+    vcodec, acodec = get_selected_codecs(info)
+    filesize = sum(f.get('filesize') or f.get('filesize_approx') or 0 for f in formats)
+    return {
+        'width': info.get('width'),
+        'height': info.get('height'),
+        'duration': info.get('duration'),
+        'vcodec': vcodec,
+        'acodec': acodec,
+        'filesize': filesize or None,
+        'fps': info.get('fps'),
+    }
+
+def get_media_dimensions(media: Optional[Dict]) -> Optional[Tuple[int, int]]:
+    """Get (width, height) from a media descriptor, if both are known."""
+    if media and media.get('width') and media.get('height'):
+        return media['width'], media['height']
+    return None
+
+def download_video(video_id: str, temp_folder: str, session: YoutubeSession,
+                   rate_limiter: Optional[RateLimiter] = None) -> Optional[Dict]:
+    """Download video in highest quality using yt-dlp, remuxing to MP4 when the codecs allow and re-encoding only when they don't, handling SABR formats."""
+    url = f"https://www.youtube.com/watch?v={video_id}"
+    if rate_limiter is None:
+        rate_limiter = RateLimiter(0)
+    # The info fetched while enriching the video saves extracting it again, if it was fetched recently enough
+    info = session.recall(video_id)
+
+    for attempt in range(3):
+        started = time.monotonic()
+        try:
+            download = _download_video_once(video_id, url, temp_folder, session, rate_limiter, info)
+            if download:
+                log_event(f"Downloaded {video_id} to {download['path']}", stage='download', vid_id=video_id,
+                          duration=time.monotonic() - started, bytes=download['media']['filesize'])
+            return download
+        except Exception as e:
+            info = None  # Extract afresh on a retry, in case the format URLs were the problem
+            if is_throttle_error(e):
+                rate_limiter.record_throttle(str(e))
+                if attempt < 2:
+                    continue  # acquire() waits out the back-off before the retry
+            print(f"Download failed for {video_id}: {e}")
+            log_event(f"Download failed for {video_id}: {e}", level=logging.WARNING, stage='download', vid_id=video_id,
+                      duration=time.monotonic() - started, error=str(e))
             return None
+    return None
 
-        # Always normalize audio to ensure it passes verification
-        # video_path = normalize_audio(video_path, temp_folder, video_id, log_file)
-        return video_path
-    except Exception as e:
-        print(f"Download failed for {video_id}: {e}")
+def _download_video_once(video_id: str, url: str, temp_folder: str, session: YoutubeSession, rate_limiter: RateLimiter,
+                         info: Optional[Dict] = None) -> Optional[Dict]:
+    """Inspect and download one video, extracting it only if no info is given, pacing the YouTube requests; errors are left to the caller."""
+    # Every download client selects formats the same way, so the remuxing one also does the inspecting
+    inspector = session.download_client(temp_folder, remux=True)
+    if info is None:
+        rate_limiter.acquire()
+        info = inspector.extract_info(url, download=False)
+    else:
+        # Select the download format from the formats already fetched, without another request
+        info = inspector.process_ie_result(dict(info), download=False)
+
+    vcodec, acodec = get_selected_codecs(info)
+    remux_only = is_web_video_codec(vcodec) and is_web_audio_codec(acodec)
+    conversion_args: Optional[List[str]] = None
+    format_id = info.get('format_id', DOWNLOAD_FORMAT)
+    if remux_only:
+        processing = f"remux only (stream copy of {vcodec}/{acodec})"
+    else:
+        # Convert to MP4 with H.264/AAC for better iOS compatibility, copying whichever stream is already compatible.
+        # The conversion itself runs later in the media pool (run_media_job), not in the download thread.
+        video_args = ['-c:v', 'copy'] if is_web_video_codec(vcodec) else ['-c:v', 'libx264', '-pix_fmt', 'yuv420p']
+        audio_args = ['-c:a', 'copy'] if is_web_audio_codec(acodec) else ['-c:a', 'aac']
+        conversion_args = video_args + audio_args + ['-movflags', '+faststart']
+        processing = f"re-encode ({vcodec}/{acodec} -> h264/aac, {' '.join(video_args + audio_args)})"
+    log_event(f"Download path for {video_id}: format {format_id}, {processing}", stage='download', vid_id=video_id)
+
+    # Downloading from the inspected info (rather than the URL) gets exactly the selected formats without extracting again
+    rate_limiter.acquire()
+    session.download_client(temp_folder, remux=remux_only).process_ie_result(dict(info), download=True)
+    rate_limiter.record_success()
+
+    # Find video file (MP4 after remuxing, otherwise the merged file waiting for conversion)
+    extensions = ('.mp4',) if remux_only else ('.mkv', '.webm', '.mp4')
+    actual_video = next((f for f in os.listdir(temp_folder) if f.startswith(video_id) and f.endswith(extensions)), None)
+    if not actual_video:
         return None
+    video_path = os.path.join(temp_folder, actual_video)
+    media = build_media_descriptor(info)
+    media['filesize'] = os.path.getsize(video_path)
+    return {'path': video_path, 'media': media, 'remuxed': remux_only, 'web_optimized': True,
+            'conversion_args': conversion_args, 'format_id': format_id}
+
+class DaemonError(Exception):
+    """Raised when the lbrynet daemon answers a call with an error or without a result."""
+
+class DaemonClient:
+    """JSON-RPC client for the lbrynet daemon with a pooled keep-alive session, per-method timeouts and batch calls."""
 
-def claim_exists(video_name: str, log_file: str) -> bool:
-    """Check if a valid claim (active stream with source) with the given name already exists on Odysee using LBRY API."""
-    api_url = "http://localhost:5279"
-    data = {
-        "jsonrpc": "2.0",
-        "method": "resolve",
-        "params": {"urls": [video_name]},
-        "id": 1
+    # Seconds to wait for each method; publish hashes (and may transcode) the whole file before answering
+    DEFAULT_TIMEOUTS: Dict[str, float] = {
+        'publish': 4 * 3600.0,
+        'blob_reflect': 1800.0,
+        'blob_clean': 600.0,
+        'resolve': 120.0,
     }
-    try:
-        response = requests.post(api_url, json=data)
+
+    def __init__(self, url: str = LBRY_DAEMON_URL, timeout: float = 60.0, timeouts: Optional[Dict[str, float]] = None,
+                 pool_size: int = 8) -> None:
+        self.url = url
+        self.timeout = timeout
+        self.timeouts = {**self.DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._ids = itertools.count(1)
+        self._batch_supported = True
+
+    def _request(self, method: str, params: Dict) -> Dict:
+        return {"jsonrpc": "2.0", "method": method, "params": params, "id": next(self._ids)}
+
+    def _timeout(self, method: str) -> float:
+        return self.timeouts.get(method, self.timeout)
+
+    @staticmethod
+    def _result(body: Dict, method: str) -> Any:
+        if body.get("error"):
+            raise DaemonError(f"{method} failed: {json.dumps(body['error'])}")
+        if "result" not in body:
+            raise DaemonError(f"No 'result' in {method} response: {json.dumps(body)}")
+        return body["result"]
+
+    def call(self, method: str, **params: Any) -> Any:
+        """Call a daemon method and return its result, raising DaemonError if the daemon reports a failure."""
+        response = self.session.post(self.url, json=self._request(method, params), timeout=self._timeout(method))
         response.raise_for_status()
-        result = response.json().get("result", {})
-        if video_name in result:
-            claim = result[video_name]
-            # Check if it's a valid stream claim with a source (file)
-            if claim.get('value_type') == 'stream' and claim.get('value', {}).get('source'):
-                with open(log_file, 'a', encoding='utf-8') as log:
-                    log.write(f"Valid claim '{video_name}' already exists on Odysee (active stream). Skipping upload.\n")
-                return True
-            else:
-                with open(log_file, 'a', encoding='utf-8') as log:
-                    log.write(f"Claim '{video_name}' exists but is invalid/inactive (no source or not a stream). Proceeding with upload.\n")
-                return False
-        return False
-    except Exception as e:
-        with open(log_file, 'a', encoding='utf-8') as log:
-            log.write(f"Failed to check if claim '{video_name}' exists: {str(e)}\n")
-        print(f"Warning: Failed to check existing claim: {e}. Proceeding with upload.")
-        return False  # Assume not exists on error to avoid blocking
+        return self._result(response.json(), method)
 
-def upload_to_odysee(video_path: str, thumbnail_url: str, title: str, description: str, channel_name: Optional[str],
-                     bid: str, log_file: str, duration: str, upload_date: str, content_type: str, tags: List[str]) -> bool:
-    """Upload video to Odysee using LBRY API (requires daemon running at localhost:5279)."""
-    api_url = "http://localhost:5279"
+    def batch(self, calls: List[Tuple[str, Dict]]) -> List[Any]:
+        """Send several calls as one JSON-RPC batch; each result is returned in order, or a DaemonError if that call failed."""
+        if self._batch_supported and len(calls) > 1:
+            batch_requests = [self._request(method, params) for method, params in calls]
+            try:
+                response = self.session.post(self.url, json=batch_requests,
+                                             timeout=sum(self._timeout(method) for method, _ in calls))
+                response.raise_for_status()
+                body = response.json()
+            except (requests.HTTPError, ValueError):
+                body = None
+            if isinstance(body, list):
+                by_id = {item.get("id"): item for item in body if isinstance(item, dict)}
+                results: List[Any] = []
+                for request, (method, _) in zip(batch_requests, calls):
+                    try:
+                        results.append(self._result(by_id.get(request["id"], {}), method))
+                    except DaemonError as e:
+                        results.append(e)
+                return results
+            # The daemon didn't understand the batch; send calls one at a time on the pooled session from now on
+            self._batch_supported = False
+
+        results = []
+        for method, params in calls:
+            try:
+                results.append(self.call(method, **params))
+            except DaemonError as e:
+                results.append(e)
+        return results
+
+def is_valid_stream_claim(claim: Dict) -> bool:
+    """Check if a resolved claim is an active stream with a source (file)."""
+    return claim.get('value_type') == 'stream' and bool(claim.get('value', {}).get('source'))
 
+class ClaimIndex:
+    """Claim URLs (see claim_url) of streams that already have a valid claim on Odysee, resolved in batches and cached on disk between runs.
+
+    URLs include the Odysee channel, so a name taken in one channel doesn't count as migrated for another.
+    """
+
+    def __init__(self, daemon: DaemonClient, cache_file: str, batch_size: int = 100,
+                 calls_per_request: int = 5) -> None:
+        self.daemon = daemon
+        self.cache_file = cache_file
+        self.batch_size = batch_size
+        self.calls_per_request = calls_per_request
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                self.names = set(json.load(f))
+        except FileNotFoundError:
+            self.names = set()
+        except ValueError as e:
+            log_event(f"Ignoring unreadable claim index {cache_file}: {e}", level=logging.WARNING, stage='claims', error=str(e))
+            self.names = set()
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self.names
+
+    def refresh(self, names: Iterable[str]) -> None:
+        """Resolve every name not already known to have a valid claim, using batched multi-URL resolve calls."""
+        started = time.monotonic()
+        with self._lock:
+            unknown = sorted(set(names) - self.names)
+        url_batches = [unknown[i:i + self.batch_size] for i in range(0, len(unknown), self.batch_size)]
+        calls = 0
+        for i in range(0, len(url_batches), self.calls_per_request):
+            group = url_batches[i:i + self.calls_per_request]
+            calls += len(group)
+            try:
+                results = self.daemon.batch([("resolve", {"urls": batch}) for batch in group])
+            except Exception as e:
+                results = [e] * len(group)
+
+            for batch, result in zip(group, results):
+                if isinstance(result, Exception):
+                    log_event(f"Failed to resolve {len(batch)} claim names: {str(result)}", level=logging.WARNING, stage='claims')
+                    print(f"Warning: Failed to check existing claims: {result}. Unchecked videos will be uploaded.")
+                    continue  # Assume not exists on error to avoid blocking
+
+                for name in batch:
+                    claim = result.get(name)
+                    if not claim or 'error' in claim:
+                        continue
+                    if is_valid_stream_claim(claim):
+                        with self._lock:
+                            self.names.add(name)
+                    else:
+                        log_event(f"Claim '{name}' exists but is invalid/inactive (no source or not a stream). Proceeding with upload.", stage='claims')
+
+        log_event(f"Claim index refreshed: resolved {len(unknown)} names in {calls} calls, {len(self.names)} known claims.", stage='claims',
+                  duration=time.monotonic() - started, names=len(unknown))
+        self.save()
+
+    def add(self, name: str) -> None:
+        """Record a newly published claim and update the cache file."""
+        with self._lock:
+            self.names.add(name)
+        self.save()
+
+    def save(self) -> None:
+        """Write the index to its cache file; a failed write is only logged, the names are still known for this run."""
+        tmp_file = f"{self.cache_file}.tmp"
+        try:
+            with self._save_lock:  # Publish workers share the one tmp file; the last save writes the newest names
+                with self._lock:
+                    names = sorted(self.names)
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(names, f, indent=4, ensure_ascii=False)
+                os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            log_event(f"Failed to save claim index {self.cache_file}: {e}", level=logging.WARNING, stage='claims', error=str(e))
+
+def find_name_collisions(videos_sorted: List[Tuple[str, Dict]]) -> List[str]:
+    """Return ids of videos whose claim name is already used by an older video in the same batch."""
+    first_by_name: Dict[str, str] = {}
+    collisions: List[str] = []
+    for vid_id, info in videos_sorted:
+        video_name = sanitize_name(info['title'])
+        if video_name in first_by_name:
+            log_event(f"Name collision: {info['title']} (ID: {vid_id}) would publish as '{video_name}', already used by "
+                      f"{first_by_name[video_name]}. Skipping it; rename one of them on YouTube to migrate both.", stage='claims', vid_id=vid_id)
+            collisions.append(vid_id)
+        else:
+            first_by_name[video_name] = vid_id
+    return collisions
+
+def upload_to_odysee(video_path: str, thumbnail_url: str, title: str, description: str, channel_name: Optional[str],
+                     bid: str, duration: str, upload_date: str, content_type: str, tags: List[str],
+                     daemon: DaemonClient, web_optimized: bool = False, is_vertical: Optional[bool] = None,
+                     vid_id: Optional[str] = None) -> Optional[Dict]:
+    """Upload video to Odysee using LBRY API (requires the lbrynet daemon to be running); returns the publish result."""
     # Verify video file exists
     video_path = os.path.normpath(video_path)
     if not os.path.isfile(video_path):
-        with open(log_file, 'a', encoding='utf-8') as log:
-            log.write(f"Video file not found: {video_path}\n")
-        return False
+        log_event(f"Video file not found: {video_path}", stage='publish')
+        return None
+    # Sized up front, so once the claim may exist nothing but the publish call itself can fail and be retried
+    video_bytes = os.path.getsize(video_path)
 
     # Detect if short/vertical and adjust params
-    is_short = content_type == 'short' or is_vertical_short(video_path)
-    optimize_file = False if is_short else True  # Disable optimization for shorts to avoid re-encoding issues
+    if is_vertical is None:
+        is_vertical = is_vertical_short(video_path)
+    is_short = content_type == 'short' or is_vertical
+    # Disable optimization for shorts to avoid re-encoding issues, and for files download_video already made
+    # web-ready (H.264/AAC MP4 with faststart) so they aren't transcoded a second time
+    optimize_file = not (is_short or web_optimized)
 
     # Prepare release time
     try:
@@ -368,231 +1782,876 @@ def upload_to_odysee(video_path: str, thumbnail_url: str, title: str, descriptio
     if channel_name:
         params_video["channel_name"] = channel_name
 
-    data_video = {
-        "jsonrpc": "2.0",
-        "method": "publish",
-        "params": params_video,
-        "id": 1
-    }
-
     for attempt in range(3):  # Retry up to 3 times
+        started = time.monotonic()
         try:
-            response_video = requests.post(api_url, json=data_video)
-            response_video.raise_for_status()
-            result_video = response_video.json()
-            if "result" not in result_video:
-                with open(log_file, 'a', encoding='utf-8') as log:
-                    log.write(f"Video publish failed for {title} (attempt {attempt + 1}): No 'result' in response: {json.dumps(result_video)}\n")
-                time.sleep(5)
-                continue
-            with open(log_file, 'a', encoding='utf-8') as log:
-                log.write(f"Uploaded {title} (name: {video_name}) to Odysee: {json.dumps(result_video)}\n")
-            # Reflect all blobs and clean cache after successful upload
-            reflect_and_clean_blobs(log_file)
-            return True
+            result_video = daemon.call("publish", **params_video)
+        except requests.Timeout as e:
+            # The daemon may still be publishing; retrying could create a second claim with the same name
+            log_event(f"Video publish timed out for {title} (attempt {attempt + 1}): {str(e)}. Not retrying.", level=logging.WARNING, stage='publish',
+                      vid_id=vid_id, duration=time.monotonic() - started, error=str(e))
+            return None
         except Exception as e:
-            with open(log_file, 'a', encoding='utf-8') as log:
-                log.write(f"Video publish failed for {title} (attempt {attempt + 1}): {str(e)}\n")
+            log_event(f"Video publish failed for {title} (attempt {attempt + 1}): {str(e)}", level=logging.WARNING, stage='publish',
+                      vid_id=vid_id, duration=time.monotonic() - started, error=str(e))
             time.sleep(5)
-    return False
-
-def reflect_and_clean_blobs(log_file: str) -> None:
-    """Reflect all saved blobs to distribute to the network, then clean the blob cache."""
-    api_url = "http://localhost:5279"
-    reflector_servers = [
-        "reflector.lbry.com:5566",
-        "lbryumx1.lbry.com:5566",
-        "lbryumx2.lbry.com:5566",
-        "blobcache-eu.odycdn.com:5567",
-        "blobcache-eu.odycdn.com:5568",
-        "blobcache-eu.odycdn.com:5569"
-    ]
-
-    # Step 1: List all finished blobs
-    data_list = {
-        "jsonrpc": "2.0",
-        "method": "blob_list",
-        "params": {"finished": True},
-        "id": 1
-    }
+            continue
+        log_event(f"Uploaded {title} (name: {video_name}) to Odysee: {json.dumps(result_video)}", stage='publish', vid_id=vid_id,
+                  duration=time.monotonic() - started, bytes=video_bytes, claim_name=video_name)
+        return result_video
+    return None
+
+def get_publish_claim_id(publish_result: Dict) -> Optional[str]:
+    """Get the claim_id of the stream created by a publish call, if present."""
+    for output in publish_result.get("outputs", []):
+        if output.get("claim_id"):
+            return output["claim_id"]
+    return None
+
+def get_publish_sd_hash(publish_result: Dict) -> Optional[str]:
+    """Get the sd_hash of the stream created by a publish call, if present."""
+    for output in publish_result.get("outputs", []):
+        sd_hash = output.get("value", {}).get("source", {}).get("sd_hash")
+        if sd_hash:
+            return sd_hash
+    return None
+
+def list_spendable_outputs(daemon: DaemonClient, min_amount: float) -> List[Dict]:
+    """List the wallet's unspent outputs that are each large enough to pay for a publish on their own."""
+    outputs: List[Dict] = []
+    page = 1
+    while True:
+        result = daemon.call("utxo_list", page=page, page_size=100)
+        outputs.extend(utxo for utxo in result.get("items", []) if float(utxo.get("amount", 0)) >= min_amount)
+        if page >= result.get("total_pages", 1):
+            return outputs
+        page += 1
+
+def prepare_wallet_outputs(daemon: DaemonClient, count: int, bid: str, fee_margin: float = 0.01,
+                           wait: float = 120.0) -> int:
+    """Split the wallet's balance into at least count outputs that can each fund a publish, returning how many there are."""
+    min_amount = float(bid) + fee_margin
     try:
-        response_list = requests.post(api_url, json=data_list)
-        response_list.raise_for_status()
-        result_list = response_list.json()
-        if "result" not in result_list or "items" not in result_list["result"]:
-            raise ValueError("Blob list failed or returned unexpected result.")
-        blob_hashes = result_list["result"]["items"]
-        with open(log_file, 'a', encoding='utf-8') as log:
-            log.write(f"Found {len(blob_hashes)} finished blobs to reflect.\n")
+        spendable = len(list_spendable_outputs(daemon, min_amount))
+        if spendable >= count:
+            log_event(f"Wallet already has {spendable} spendable outputs for {count} parallel publishes.", stage='wallet')
+            return spendable
+
+        # account_fund splits the amount evenly over the outputs; keep a little back for the transaction fee
+        available = float(daemon.call("wallet_balance").get("available", 0)) - fee_margin
+        outputs = min(count, int(available // min_amount))
+        if outputs <= spendable:
+            log_event(f"Balance of {available + fee_margin:.4f} LBC can't fund {count} parallel publishes; "
+                      f"using {max(1, spendable)}.", stage='wallet')
+            return max(1, spendable)
+        amount = f"{int(available * 10 ** 8) / 10 ** 8:.8f}".rstrip('0').rstrip('.')
+        daemon.call("account_fund", amount=amount, outputs=outputs, broadcast=True)
+        log_event(f"Split {amount} LBC into {outputs} outputs for parallel publishes.", stage='wallet')
+
+        # Wait until the wallet lists the new outputs so the first publishes don't race for the old one
+        deadline = time.monotonic() + wait
+        while time.monotonic() < deadline:
+            spendable = len(list_spendable_outputs(daemon, min_amount))
+            if spendable >= outputs:
+                break
+            time.sleep(5)
+        return max(1, spendable)
     except Exception as e:
-        with open(log_file, 'a', encoding='utf-8') as log:
-            log.write(f"Failed to list blobs: {str(e)}\n")
-        return
+        log_event(f"Failed to prepare wallet outputs for parallel publishes: {str(e)}. Publishing one at a time.", level=logging.WARNING, stage='wallet', error=str(e))
+        return 1
 
-    if not blob_hashes:
-        with open(log_file, 'a', encoding='utf-8') as log:
-            log.write("No blobs to reflect.\n")
-    else:
-        reflected_count = 0
-        for reflector in reflector_servers:
-            # Step 2: Try reflecting with current server
-            data_reflect = {
-                "jsonrpc": "2.0",
-                "method": "blob_reflect",
-                "params": {"blob_hashes": blob_hashes, "reflector_server": reflector},
-                "id": 1
-            }
+class PublishScheduler:
+    """Runs publishes on up to `slots` threads at once, one per spendable wallet output so no two publishes need the same one."""
+
+    def __init__(self, slots: int) -> None:
+        self._slots = threading.BoundedSemaphore(max(1, slots))
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=slots) if slots > 1 else None
+
+    def submit(self, vid_id: str, fn: Callable[..., None], *args: Any) -> concurrent.futures.Future:
+        """Run fn(*args) once a slot is free, blocking the caller until then; with one slot it runs right away in the calling thread."""
+        self._slots.acquire()
+        if self.executor:
+            future = self.executor.submit(fn, *args)
+        else:
+            future = concurrent.futures.Future()
             try:
-                response_reflect = requests.post(api_url, json=data_reflect)
-                response_reflect.raise_for_status()
-                result_reflect = response_reflect.json()
-                if "result" in result_reflect:
-                    reflected_count = len(result_reflect["result"])
-                    with open(log_file, 'a', encoding='utf-8') as log:
-                        log.write(f"Successfully reflected {reflected_count} blobs using {reflector}.\n")
-                    break  # Success, no need to try more
-                else:
-                    raise ValueError(f"Blob reflect failed with {reflector}.")
+                future.set_result(fn(*args))
             except Exception as e:
-                with open(log_file, 'a', encoding='utf-8') as log:
-                    log.write(f"Failed to reflect blobs with {reflector}: {str(e)}\n")
-        if reflected_count == 0:
-            with open(log_file, 'a', encoding='utf-8') as log:
-                log.write("Failed to reflect blobs with all alternative servers.\n")
-
-    # Step 3: Clean blobs regardless of reflection success
-    data_clean = {
-        "jsonrpc": "2.0",
-        "method": "blob_clean",
-        "params": {},
-        "id": 1
-    }
+                future.set_exception(e)
+        future.add_done_callback(lambda f: self._finish(vid_id, f))
+        return future
+
+    def _finish(self, vid_id: str, future: concurrent.futures.Future) -> None:
+        self._slots.release()
+        if not future.cancelled() and future.exception():
+            log_event(f"Publishing {vid_id} failed unexpectedly: {future.exception()}", level=logging.WARNING, stage='publish', vid_id=vid_id)
+
+    def close(self) -> None:
+        if self.executor:
+            self.executor.shutdown()
+
+def list_stream_blobs(daemon: DaemonClient, sd_hash: str) -> List[str]:
+    """List the finished blobs belonging to a single stream, identified by its sd_hash; empty if the listing fails partway."""
+    blob_hashes: List[str] = []
+    page = 1
+    while True:
+        try:
+            result_list = daemon.call("blob_list", sd_hash=sd_hash, finished=True, page=page, page_size=100)
+            if "items" not in result_list:
+                raise ValueError("Blob list failed or returned unexpected result.")
+        except Exception as e:
+            log_event(f"Failed to list blobs for stream {sd_hash}: {str(e)}", level=logging.WARNING, stage='reflect', error=str(e))
+            return []  # Reflecting only some of the blobs would look like success
+        blob_hashes.extend(result_list["items"])
+        if page >= result_list.get("total_pages", 1):
+            return blob_hashes
+        page += 1
+
+def reflect_blobs(daemon: DaemonClient, blob_hashes: List[str], reflector_servers: Optional[List[str]] = None,
+                  vid_id: Optional[str] = None) -> Optional[str]:
+    """Reflect blobs to the first reflector that accepts them, returning that server or None if all of them failed."""
+    if not blob_hashes:
+        log_event("No blobs to reflect.", stage='reflect')
+        return None
+
+    for reflector in reflector_servers or REFLECTOR_SERVERS:
+        started = time.monotonic()
+        try:
+            result_reflect = daemon.call("blob_reflect", blob_hashes=blob_hashes, reflector_server=reflector)
+            log_event(f"Successfully reflected {len(result_reflect)} of {len(blob_hashes)} blobs using {reflector}.", stage='reflect',
+                      vid_id=vid_id, duration=time.monotonic() - started, server=reflector, blobs=len(blob_hashes))
+            return reflector
+        except Exception as e:
+            log_event(f"Failed to reflect blobs with {reflector}: {str(e)}", level=logging.WARNING, stage='reflect', vid_id=vid_id,
+                      duration=time.monotonic() - started, server=reflector, error=str(e))
+    log_event("Failed to reflect blobs with all alternative servers.", level=logging.WARNING, stage='reflect')
+    return None
+
+def get_blob_dir(daemon: DaemonClient) -> Optional[str]:
+    """Ask the daemon for its data directory, where the blob store lives."""
+    try:
+        return daemon.call("settings_get")["data_dir"]
+    except Exception as e:
+        log_event(f"Failed to get lbrynet data directory: {str(e)}", level=logging.WARNING, stage='reflect', error=str(e))
+        return None
+
+def clean_blobs(daemon: DaemonClient) -> None:
+    """Clean the daemon's blob cache to free local storage."""
+    started = time.monotonic()
     try:
-        response_clean = requests.post(api_url, json=data_clean)
-        response_clean.raise_for_status()
-        result_clean = response_clean.json()
-        if "result" in result_clean and result_clean["result"] is True:
-            with open(log_file, 'a', encoding='utf-8') as log:
-                log.write("Successfully cleaned blob cache to free local storage.\n")
+        if daemon.call("blob_clean") is True:
+            log_event("Successfully cleaned blob cache to free local storage.", stage='cleanup', duration=time.monotonic() - started)
         else:
             raise ValueError("Blob cleaning failed or returned unexpected result.")
     except Exception as e:
-        with open(log_file, 'a', encoding='utf-8') as log:
-            log.write(f"Failed to clean blobs: {str(e)}\n")
+        log_event(f"Failed to clean blobs: {str(e)}", level=logging.WARNING, stage='cleanup', duration=time.monotonic() - started,
+                  error=str(e))
+
+class ReflectorWorker:
+    """Background thread that reflects the blobs of each published stream, with retries and reflector failover."""
+
+    def __init__(self, daemon: DaemonClient, blob_dir: Optional[str] = None, clean_threshold: float = 90.0,
+                 retries: int = 3, retry_delay: float = 30.0) -> None:
+        self.daemon = daemon
+        self.blob_dir = blob_dir
+        self.clean_threshold = clean_threshold
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.servers = list(REFLECTOR_SERVERS)
+        self.jobs: queue.Queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name='reflector', daemon=True)
+        self.thread.start()
+
+    def submit(self, sd_hash: str, title: str, on_done: Optional[Callable[[bool], None]] = None,
+               vid_id: Optional[str] = None) -> None:
+        """Queue a published stream for reflection; on_done is called with whether it succeeded."""
+        self.jobs.put((sd_hash, title, on_done, vid_id))
+
+    def close(self) -> None:
+        """Wait for all queued reflections to finish and stop the worker."""
+        pending = self.jobs.qsize()
+        if pending:
+            print(f"Waiting for {pending} queued blob reflections to finish...")
+        self.jobs.put(None)
+        self.thread.join()
+
+    def _run(self) -> None:
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            sd_hash, title, on_done, vid_id = job
+            try:
+                success = self._reflect(sd_hash, title, vid_id)
+                if on_done:
+                    on_done(success)
+                self._clean_if_needed()
+            except Exception as e:
+                log_event(f"Reflector worker error for {title}: {str(e)}", level=logging.WARNING, stage='reflect', error=str(e))
+
+    def _reflect(self, sd_hash: str, title: str, vid_id: Optional[str] = None) -> bool:
+        for attempt in range(self.retries):
+            if attempt:
+                time.sleep(self.retry_delay)
+            # Right after a publish the blobs may not be finished yet, so an empty listing is retried like a failed reflect
+            blob_hashes = list_stream_blobs(self.daemon, sd_hash)
+            if not blob_hashes:
+                log_event(f"No finished blobs listed for {title} (attempt {attempt + 1}).", level=logging.WARNING, stage='reflect', vid_id=vid_id)
+                continue
+            log_event(f"Reflecting {len(blob_hashes)} blobs for {title} (attempt {attempt + 1}).", stage='reflect', vid_id=vid_id)
+            server = reflect_blobs(self.daemon, blob_hashes, self.servers, vid_id)
+            if server:
+                # Try the last working reflector first next time
+                self.servers.remove(server)
+                self.servers.insert(0, server)
+                return True
+        log_event(f"Giving up reflecting blobs for {title} after {self.retries} attempts.", level=logging.WARNING, stage='reflect', vid_id=vid_id)
+        return False
+
+    def _clean_if_needed(self) -> None:
+        if self.blob_dir is None:
+            self.blob_dir = get_blob_dir(self.daemon)
+            if self.blob_dir is None:
+                return
+        usage = shutil.disk_usage(self.blob_dir)
+        used_percent = usage.used / usage.total * 100
+        if used_percent >= self.clean_threshold:
+            log_event(f"Blob storage disk is {used_percent:.1f}% full (threshold {self.clean_threshold}%); cleaning blobs.", stage='reflect')
+            clean_blobs(self.daemon)
+
+def iter_downloaded_videos(videos_sorted: Iterable[Tuple[str, Dict]], claim_index: ClaimIndex, claim_url_of: Callable[[str, Dict], str],
+                           state: MigrationState, resume: bool, media_pool: MediaPool, temp_folder: str, session: YoutubeSession,
+                           rate_limiter: Optional[RateLimiter] = None,
+                           cache: Optional[DownloadCache] = None) -> Iterator[Tuple[str, Dict, Optional[Dict]]]:
+    """Download videos in the given order and queue their media jobs, yielding (id, info, download); download is None if the download failed."""
+    for vid_id, info in videos_sorted:
+        log_event(f"Processing {info['title']} (ID: {vid_id})", stage='download', vid_id=vid_id)
+
+        # Check if claim already exists on Odysee before downloading
+        url = claim_url_of(vid_id, info)
+        if url in claim_index:
+            log_event(f"Valid claim '{url}' already exists on Odysee (active stream). Skipping upload.", stage='download', vid_id=vid_id)
+            continue  # Skip download and upload, don't add to lists
+
+        # A resumed run reuses a file that finished downloading before the interruption
+        record = state.get(vid_id) if resume else None
+        cached = cache.get(vid_id) if cache else None
+        if record and record['stage'] == 'downloaded' and record['video_path'] and os.path.isfile(record['video_path']):
+            log_event(f"Resuming {info['title']} from downloaded file {record['video_path']}", stage='download', vid_id=vid_id)
+            download: Optional[Dict] = {'path': record['video_path'], 'media': info.get('media'), 'web_optimized': True}
+        elif cached:
+            # A file kept from an earlier attempt (e.g. a failed publish) was already converted; reuse it as it is
+            log_event(f"Reusing cached download of {info['title']} (format {cached['format_id']}): {cached['path']}", stage='download', vid_id=vid_id)
+            download = {'path': cached['path'], 'media': cached['media'] or info.get('media'), 'web_optimized': True,
+                        'format_id': cached['format_id']}
+        else:
+            download = download_video(vid_id, temp_folder, session, rate_limiter)
+        if download:
+            # Conversion (and probing, if yt-dlp didn't report the dimensions) run in the media pool while the next video downloads
+            download['media_job'] = media_pool.submit(vid_id, download['path'], download.pop('conversion_args', None),
+                                                      get_media_dimensions(download['media']))
+        yield vid_id, info, download
+
+class LeaseKeeper:
+    """Background heartbeat that keeps renewing a worker's leases on the jobs it is still working on, for up to max_hold_seconds per job."""
+
+    def __init__(self, job_queue: JobQueue, worker: str, lease_seconds: float, max_hold_seconds: float = 12 * 3600.0) -> None:
+        self.job_queue = job_queue
+        self.worker = worker
+        self.lease_seconds = lease_seconds
+        # Has to cover waiting for a publish slot, the download, conversion and a publish of up to 4 hours
+        self.max_hold_seconds = max_hold_seconds
+        self._held: Dict[str, str] = {}  # id -> title
+        self._leased_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lease-heartbeat", daemon=True)
+        self._thread.start()
+
+    def lease(self) -> Optional[Tuple[str, Dict]]:
+        """Lease the next job from the queue and start renewing it."""
+        job = self.job_queue.lease(self.worker, self.lease_seconds)
+        if job:
+            with self._lock:
+                self._held[job[0]] = job[1].get('title', job[0])
+                self._leased_at[job[0]] = time.monotonic()
+        return job
+
+    def still_held(self, vid_id: str) -> bool:
+        """Renew a job's lease right now, returning False (and no longer renewing it) if this worker doesn't hold it anymore."""
+        with self._lock:
+            title = self._held.get(vid_id)
+        if title is None:
+            return False
+        try:
+            if self.job_queue.renew(vid_id, self.worker, self.lease_seconds):
+                return True
+        except sqlite3.Error as e:
+            log_event(f"Failed to check the lease on {title} (ID: {vid_id}): {e}", level=logging.WARNING, stage='queue', vid_id=vid_id, error=str(e))
+            return False
+        self._drop(vid_id)
+        return False
+
+    def _drop(self, vid_id: str) -> None:
+        with self._lock:
+            self._held.pop(vid_id, None)
+            self._leased_at.pop(vid_id, None)
+
+    def finish(self, vid_id: str, success: bool) -> None:
+        """Stop renewing a job and record its outcome in the queue; does nothing once a job is finished or given up."""
+        with self._lock:
+            self._leased_at.pop(vid_id, None)
+            if self._held.pop(vid_id, None) is None:
+                return
+        self.job_queue.complete(vid_id, self.worker, success)
+
+    def _run(self) -> None:
+        # Renew well before expiry so one slow or failed heartbeat doesn't lose the lease
+        while not self._stop.wait(self.lease_seconds / 3):
+            with self._lock:
+                held = list(self._held.items())
+            for vid_id, title in held:
+                with self._lock:
+                    held_for = time.monotonic() - self._leased_at.get(vid_id, time.monotonic())
+                if held_for > self.max_hold_seconds:
+                    # Something is stuck on this job; let the lease run out so another worker can take it
+                    log_event(f"Stopped renewing the lease on {title} (ID: {vid_id}) after {held_for / 3600:.1f} hours; "
+                              f"another worker may pick it up.", level=logging.WARNING, stage='queue', vid_id=vid_id)
+                    self._drop(vid_id)
+                    continue
+                try:
+                    renewed = self.job_queue.renew(vid_id, self.worker, self.lease_seconds)
+                except sqlite3.Error as e:
+                    log_event(f"Failed to renew lease on {title} (ID: {vid_id}): {e}", level=logging.WARNING, stage='queue', vid_id=vid_id, error=str(e))
+                    continue
+                if not renewed:
+                    log_event(f"Lost the lease on {title} (ID: {vid_id}); another worker may pick it up.", level=logging.WARNING, stage='queue', vid_id=vid_id)
+                    self._drop(vid_id)
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+def iter_leased_jobs(lease_keeper: LeaseKeeper, claim_index: ClaimIndex,
+                     poll_interval: float = 30.0) -> Iterator[Tuple[str, Dict]]:
+    """Lease jobs one at a time until the shared queue has nothing left, waiting while other workers still hold leases that could expire."""
+    while True:
+        job = lease_keeper.lease()
+        if job is None:
+            if not lease_keeper.job_queue.has_unfinished():
+                return
+            time.sleep(poll_interval)
+            continue
+        vid_id, info = job
+        log_event(f"Leased {info['title']} (ID: {vid_id}) from the job queue", stage='queue', vid_id=vid_id)
+        # Another worker may have published it after the coordinator checked
+        url = claim_url(info.get('odysee_channel'), info['title'])
+        claim_index.refresh([url])
+        if url in claim_index:
+            log_event(f"Valid claim '{url}' already exists on Odysee (active stream). Marking job done.", stage='queue', vid_id=vid_id)
+            lease_keeper.finish(vid_id, True)
+            continue
+        yield vid_id, info
+
+def prefetch(items: Iterable[T], size: int) -> Iterator[T]:
+    """Consume an iterable in a background thread, keeping up to size results ready in a bounded queue."""
+    if size <= 0:
+        yield from items
+        return
+
+    buffer: queue.Queue = queue.Queue(maxsize=size)
+    errors: List[Exception] = []
+
+    def fill() -> None:
+        try:
+            for item in items:
+                buffer.put(item)  # Blocks while the queue is full
+        except Exception as e:
+            errors.append(e)
+        finally:
+            buffer.put(_PREFETCH_DONE)
+
+    worker = threading.Thread(target=fill, name='prefetch', daemon=True)
+    worker.start()
+    while True:
+        item = buffer.get()
+        if item is _PREFETCH_DONE:
+            break
+        yield item
+    worker.join()
+    if errors:
+        raise errors[0]
+
+def finish_reflection(state: MigrationState, vid_id: str, title: str, temp_folder: str) -> Callable[[bool], None]:
+    """Build the reflector callback that records a video as reflected and then deletes its files and records that."""
+    def on_done(success: bool) -> None:
+        if success:
+            state.set_stage(vid_id, 'reflected')
+        # The daemon has the stream's blobs, so the files aren't needed to retry the reflection either
+        delete_video_files(vid_id, title, temp_folder)
+        if success:
+            state.set_stage(vid_id, 'cleaned')  # Otherwise it stays 'published' so a --resume run retries the reflection
+    return on_done
+
+def delete_video_files(vid_id: str, title: str, temp_folder: str) -> None:
+    """Delete all files in the temp folder that belong to the given video."""
+    started = time.monotonic()
+    freed = 0
+    try:
+        # Find all files starting with vid_id
+        related_files = glob.glob(os.path.join(temp_folder, f"{vid_id}*"))
+        if not related_files:
+            log_event(f"No files found to delete for {title} (ID: {vid_id})", stage='cleanup', vid_id=vid_id)
+            return
+        for file_path in related_files:
+            if os.path.isfile(file_path):
+                try:
+                    size = os.path.getsize(file_path)
+                    os.remove(file_path)
+                    freed += size
+                    log_event(f"Deleted file: {file_path}", stage='cleanup', vid_id=vid_id)
+                except PermissionError as e:
+                    log_event(f"Failed to delete {file_path}: {e} (file may be in use)", level=logging.WARNING, stage='cleanup', error=str(e))
+                except Exception as e:
+                    log_event(f"Failed to delete {file_path}: {e}", level=logging.WARNING, stage='cleanup', error=str(e))
+    except Exception as e:
+        log_event(f"Error while attempting to delete files for {title}: {e}", level=logging.WARNING, stage='cleanup', error=str(e))
+    log_event(f"Freed {freed} bytes for {title} (ID: {vid_id})", level=logging.DEBUG, stage='cleanup', vid_id=vid_id,
+              duration=time.monotonic() - started, bytes=freed)
+
+def parse_date_window(start_date: str, end_date: Optional[str]) -> Tuple[datetime.date, datetime.date]:
+    """Parse MM-DD-YYYY start and end dates (end defaults to today), raising ValueError if they're invalid or out of order."""
+    try:
+        start = datetime.datetime.strptime(start_date, '%m-%d-%Y').date()
+        end = datetime.datetime.strptime(end_date, '%m-%d-%Y').date() if end_date else datetime.date.today()
+    except (TypeError, ValueError):
+        raise ValueError("Dates must be in MM-DD-YYYY format.")
+    if end < start:
+        raise ValueError("End date cannot be before start date.")
+    return start, end
+
+def make_channel(entry: Dict, defaults: argparse.Namespace) -> Dict:
+    """Build a channel mapping from a config entry, taking the content type and dates from the command line where it leaves them out.
+
+    Without an odysee_channel_name the channel's videos are published anonymously, like ODYSEE_CHANNEL_NAME = None.
+    """
+    if not entry.get('youtube_channel_url'):
+        raise ValueError(f"Channel entry {entry} is missing 'youtube_channel_url'.")
+    content_type = entry.get('content_type', defaults.content_type)
+    if content_type not in ('videos', 'livestreams', 'shorts', 'all'):
+        raise ValueError(f"Channel {entry['youtube_channel_url']} needs a content_type of videos, livestreams, shorts or all.")
+    start_date, end_date = parse_date_window(entry.get('start_date', defaults.start_date), entry.get('end_date', defaults.end_date))
+    return {
+        'youtube_channel_url': entry['youtube_channel_url'].rstrip('/'),
+        'odysee_channel_name': entry.get('odysee_channel_name') or None,
+        'bid': str(entry.get('bid', ODYSEE_BID)),
+        'content_types': ['videos', 'livestreams', 'shorts'] if content_type == 'all' else [content_type],
+        'start_date': start_date,
+        'end_date': end_date,
+    }
+
+def load_channels(config_file: str, defaults: argparse.Namespace) -> List[Dict]:
+    """Read the list of YouTube to Odysee channel mappings from a JSON config file."""
+    with open(config_file, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    if isinstance(entries, dict):
+        entries = entries.get('channels', [])
+    if not entries:
+        raise ValueError(f"No channels listed in {config_file}.")
+    return [make_channel(entry, defaults) for entry in entries]
+
+def interleave(groups: Iterable[List[T]]) -> List[T]:
+    """Merge lists by taking one item from each in turn, so no list has to wait for another to run out."""
+    missing = object()
+    return [item for items in itertools.zip_longest(*groups, fillvalue=missing) for item in items if item is not missing]
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Migrate YouTube content to Odysee.")
-    parser.add_argument('--start-date', required=True, help="Earliest upload date (MM-DD-YYYY)")
+    parser.add_argument('--start-date', help="Earliest upload date (MM-DD-YYYY); required unless --role worker or every channel in --channels-config has one")
     parser.add_argument('--end-date', default=datetime.date.today().strftime('%m-%d-%Y'), help="Latest upload date (MM-DD-YYYY), defaults to today")
-    parser.add_argument('--content-type', choices=['videos', 'livestreams', 'shorts', 'all'], required=True, help="Content type to migrate")
+    parser.add_argument('--content-type', choices=['videos', 'livestreams', 'shorts', 'all'],
+                        help="Content type to migrate; required unless --role worker")
     parser.add_argument('--temp-folder', required=True, help="Temporary folder for downloads")
     parser.add_argument('--cookies', default=None, help="Path to cookies.txt for authenticated access (optional)")
     parser.add_argument('--verbose', action='store_true', help="Enable verbose output for debugging")
+    parser.add_argument('--metadata-workers', type=int, default=4,
+                        help="Number of videos to fetch full metadata for at the same time")
+    parser.add_argument('--requests-per-second', type=float, default=0.5,
+                        help="Starting rate of requests per second to YouTube across all workers, when no pacing_state.json exists yet")
+    parser.add_argument('--max-requests-per-second', type=float, default=2.0,
+                        help="Highest rate the adaptive pacing may speed up to while YouTube isn't throttling")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only scan the channel until the first video already in video_log; older videos come from video_log")
+    parser.add_argument('--refresh-claims', action='store_true',
+                        help="Ignore the cached claim index and re-check every video against Odysee")
+    parser.add_argument('--daemon-url', default=LBRY_DAEMON_URL, help="lbrynet daemon JSON-RPC address")
+    parser.add_argument('--blob-dir', default=None,
+                        help="lbrynet blob folder to watch for disk usage (defaults to the daemon's data directory)")
+    parser.add_argument('--blob-clean-threshold', type=float, default=90.0,
+                        help="Clean the blob cache once the blob folder's disk is this percent full")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue each video from the last stage it completed in a previous, interrupted run")
+    parser.add_argument('--media-workers', type=int, default=2,
+                        help="Number of ffmpeg/ffprobe jobs allowed to run at once in separate processes (0 = run them in the download thread)")
+    parser.add_argument('--normalize-audio', action='store_true',
+                        help="Adjust each video's audio to --loudness-target (one audio-only analysis pass, gain applied while converting)")
+    parser.add_argument('--loudness-target', type=float, default=-16.0,
+                        help="Integrated loudness in LUFS to normalise audio to (defaults to -16)")
+    parser.add_argument('--cache-max-bytes', type=parse_size, default=parse_size('20G'),
+                        help="Keep finished downloads in the temp folder up to this size (e.g. 500G) so failed publishes don't re-download; "
+                             "least recently used files are evicted first (0 = delete every file after its attempt)")
+    parser.add_argument('--publish-workers', type=int, default=1,
+                        help="Number of videos to publish at the same time; the wallet balance is split into that many outputs first")
+    parser.add_argument('--prefetch', type=int, default=0,
+                        help="Number of downloaded videos allowed to wait for publishing while the next downloads run (0 = one at a time)")
+    parser.add_argument('--channels-config', default=None,
+                        help="JSON file listing channels to migrate together (youtube_channel_url and optionally odysee_channel_name, "
+                             "bid, content_type, start_date, end_date); replaces YOUTUBE_CHANNEL_URL and ODYSEE_CHANNEL_NAME")
+    parser.add_argument('--role', choices=['standalone', 'coordinator', 'worker'], default='standalone',
+                        help="standalone does everything; coordinator only finds videos and queues them in --queue-db; "
+                             "worker migrates videos leased from --queue-db using its own lbrynet daemon")
+    parser.add_argument('--queue-db', default=None,
+                        help="SQLite job queue shared by the coordinator and workers, on a volume all of them can reach")
+    parser.add_argument('--worker-id', default=f"{socket.gethostname()}-{os.getpid()}",
+                        help="Name this worker leases jobs under (defaults to hostname-pid)")
+    parser.add_argument('--lease-seconds', type=float, default=900.0,
+                        help="How long a worker's lease on a job lasts without a heartbeat before another worker may take it over")
+    parser.add_argument('--max-lease-hours', type=float, default=12.0,
+                        help="Longest a worker keeps renewing its lease on one job (download, conversion and publish together) "
+                             "before giving it up as stuck")
+    parser.add_argument('--profile', action='store_true',
+                        help="Write migration_profile_<run>.txt at the end with per-stage timings, histograms and the slowest videos")
+    parser.add_argument('--metrics-textfile', default=None,
+                        help="Keep Prometheus metrics for each stage in this file (for node_exporter's textfile collector)")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="Serve Prometheus metrics for each stage on http://127.0.0.1:<port>/metrics while the run lasts")
+    parser.add_argument('--include', action='append', type=parse_selection_filter, default=[], metavar='FILTER',
+                        help="Only migrate videos matching FILTER: id=ID1,ID2, id=@ids.txt, type=short, duration<=10:00 or "
+                             "date>=01-31-2020 (repeatable; a video has to match all of them)")
+    parser.add_argument('--exclude', action='append', type=parse_selection_filter, default=[], metavar='FILTER',
+                        help="Skip videos matching FILTER, in the same form as --include (repeatable)")
+    parser.add_argument('--write-plan', default=None, metavar='FILE',
+                        help="Extract and filter the videos, write them to FILE (one JSON line per video) and exit without migrating")
+    parser.add_argument('--plan', default=None, metavar='FILE',
+                        help="Migrate the videos listed in FILE (written by --write-plan) instead of extracting them from YouTube")
+    parser.add_argument('--yes', action='store_true', help="Skip the confirmation and migrate every selected video")
     args = parser.parse_args()
 
-    try:
-        start_date = datetime.datetime.strptime(args.start_date, '%m-%d-%Y').date()
-        end_date = datetime.datetime.strptime(args.end_date, '%m-%d-%Y').date()
-    except ValueError:
-        print("Error: Dates must be in MM-DD-YYYY format.")
-        sys.exit(1)
+    if args.role != 'standalone' and not args.queue_db:
+        parser.error(f"--queue-db is required with --role {args.role}")
+    if args.role == 'worker' and (args.plan or args.write_plan):
+        parser.error("--plan and --write-plan can't be used with --role worker")
+    if args.role != 'worker' and not args.channels_config and not args.plan and not (args.start_date and args.content_type):
+        parser.error("--start-date and --content-type are required unless --role worker or --plan")
 
-    if end_date < start_date:
-        print("Error: End date cannot be before start date.")
-        sys.exit(1)
-    if end_date > datetime.date.today():
-        print(f"Warning: End date {end_date} is in the future, which may exclude most videos.")
+    # Each channel has its own Odysee channel, bid, content types and dates; without a config file it's the one configured above
+    channels: List[Dict] = []
+    if args.role != 'worker' and not args.plan:
+        try:
+            if args.channels_config:
+                channels = load_channels(args.channels_config, args)
+            else:
+                channels = [make_channel({'youtube_channel_url': YOUTUBE_CHANNEL_URL, 'odysee_channel_name': ODYSEE_CHANNEL_NAME}, args)]
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        for channel in channels:
+            if channel['end_date'] > datetime.date.today():
+                print(f"Warning: End date {channel['end_date']} is in the future, which may exclude most videos.")
 
     os.makedirs(args.temp_folder, exist_ok=True)
     log_file = "migration_log.txt"
-    with open(log_file, 'w', encoding='utf-8') as log:
-        log.write(f"Started migration on {datetime.datetime.now()} to Odysee\n")
+    run_started = time.monotonic()
+    run_id = setup_logging(log_file, "migration_events.jsonl")
+    log_event(f"Started migration on {datetime.datetime.now()} to Odysee", stage='run', run_role=args.role)
+    # Stage timings and byte counts come from the events logged along the way
+    metrics.detailed = args.profile
+    exporter = None
+    if args.metrics_textfile or args.metrics_port is not None:
+        try:
+            exporter = MetricsExporter(metrics, args.metrics_textfile, args.metrics_port)
+        except OSError as e:
+            print(f"Error: Can't serve metrics on port {args.metrics_port}: {e}")
+            sys.exit(1)
+    profile_file = f"migration_profile_{run_id}.txt"
 
-    # Load or initialize video_log
-    video_log_file = "video_log.json"
-    try:
-        with open(video_log_file, 'r', encoding='utf-8') as f:
-            video_log = json.load(f)
-    except FileNotFoundError:
-        video_log = {}
+    # Open video_log, importing the old JSON file the first time
+    video_log = VideoLog("video_log.db")
+    if not len(video_log) and os.path.isfile("video_log.json"):
+        imported = video_log.import_json("video_log.json")
+        log_event(f"Imported {imported} entries from video_log.json into video_log.db", stage='run')
 
-    # Determine content types to fetch
-    content_types = ['videos', 'livestreams', 'shorts'] if args.content_type == 'all' else [args.content_type]
+    # Pacing adapts to YouTube's throttling and carries over to the next run through pacing_state.json
+    rate_limiter = AdaptiveRateLimiter(args.requests_per_second, args.max_requests_per_second, "pacing_state.json")
+    # One set of YoutubeDL clients and one cookie jar for every YouTube request of the run
+    youtube = YoutubeSession(args.cookies, args.verbose)
+    job_queue = JobQueue(args.queue_db) if args.role != 'standalone' else None
 
-    # Extract and filter videos
-    video_dict = {}
-    for ctype in content_types:
-        video_dict.update(extract_youtube_content(YOUTUBE_CHANNEL_URL, ctype, start_date, end_date,
-                                                  args.cookies, args.verbose, log_file, video_log))
+    videos_by_channel: List[List[Tuple[str, Dict]]] = []
+    targets: Dict[str, Tuple[str, str]] = {}  # id -> (Odysee channel, bid)
+    if args.role != 'worker' and args.plan:
+        # The plan already has every video's metadata and Odysee channel, so YouTube isn't asked again
+        try:
+            video_dict, targets = load_plan(args.plan)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        odysee_channels = list(dict.fromkeys(channel_name for channel_name, _ in targets.values()))
+        channel_of = {vid_id: odysee_channels.index(targets[vid_id][0]) for vid_id in video_dict}
+        channel_count = len(odysee_channels)
+        log_event(f"Loaded {len(video_dict)} videos from {args.plan}", stage='discover')
+    elif args.role != 'worker':  # Workers get their videos from the job queue instead
+        # Extract and filter videos; every tab of every channel is scanned at the same time, sharing one rate limit and
+        # one lookup per id. The lookups take turns between channels, so each channel gets its share of the budget.
+        tasks = [(channel, ctype) for ctype in ('videos', 'livestreams', 'shorts') for channel in channels
+                 if ctype in channel['content_types']]
+        tab_workers = args.metadata_workers if len(channels) == 1 else max(1, args.metadata_workers // len(channels))
+        video_dict = {}
+        channel_of: Dict[str, int] = {}
+        shared = SharedEnrichment(youtube, rate_limiter, args.metadata_workers)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(tasks))) as tab_executor:
+            tab_results = [(channels.index(channel),
+                            tab_executor.submit(extract_youtube_content, channel['youtube_channel_url'], ctype,
+                                                channel['start_date'], channel['end_date'], args.cookies, args.verbose, video_log, tab_workers, rate_limiter, args.incremental, shared))
+                           for channel, ctype in tasks]
+            for channel_number, tab_result in tab_results:
+                for vid_id, data in tab_result.result().items():
+                    video_dict[vid_id] = data
+                    channel_of[vid_id] = channel_number
+        shared.close()
+        # Take each entry from video_log so an id listed under several tabs gets its one resolved type
+        video_dict = {vid_id: video_log.get(vid_id, data) for vid_id, data in video_dict.items()}
+        targets = {vid_id: (channels[channel_of[vid_id]]['odysee_channel_name'], channels[channel_of[vid_id]]['bid'])
+                   for vid_id in video_dict}
+        channel_count = len(channels)
 
-    # Save updated video_log
-    with open(video_log_file, 'w', encoding='utf-8') as f:
-        json.dump(video_log, f, indent=4, ensure_ascii=False)
+    if args.role != 'worker':
+        if args.include or args.exclude:
+            before = len(video_dict)
+            video_dict = select_videos(video_dict, args.include, args.exclude)
+            log_event(f"Filters kept {len(video_dict)} of {before} videos", stage='discover')
 
-    # User confirmation with cancel option
-    video_dict = confirm_videos(video_dict, log_file)
+        if args.write_plan:
+            write_plan(args.write_plan, video_dict, targets)
+            log_event(f"Wrote {len(video_dict)} videos to {args.write_plan}", stage='discover')
+            if job_queue:
+                job_queue.close()
+            video_log.close()
+            rate_limiter.save()
+            youtube.close()
+            if exporter:
+                exporter.close()
+            if args.profile:
+                write_profile(profile_file, run_id, metrics, time.monotonic() - run_started)
+            print(f"Wrote a plan of {len(video_dict)} videos to {args.write_plan}; migrate them with --plan {args.write_plan}.")
+            return
 
-    # Sort videos by upload_date, oldest first
-    videos_sorted = sorted(video_dict.items(), key=lambda x: x[1]['upload_date'])
+        # User confirmation with cancel option
+        if not args.yes:
+            video_dict = confirm_videos(video_dict)
+
+        # Sort each channel's videos by upload_date, oldest first
+        videos_by_channel = [[] for _ in range(channel_count)]
+        for vid_id, info in sorted(video_dict.items(), key=lambda x: x[1]['upload_date']):
+            videos_by_channel[channel_of[vid_id]].append((vid_id, info))
 
     # Track successful and failed uploads
     successful_ids: List[str] = []
     failed_ids: List[str] = []
 
-    # Process each video in sorted order
+    # Each video's Odysee channel and bid; jobs leased by a worker carry their own
+    def target_of(vid_id: str, info: Dict) -> Tuple[Optional[str], str]:
+        return targets.get(vid_id) or (info.get('odysee_channel', ODYSEE_CHANNEL_NAME), str(info.get('bid', ODYSEE_BID)))
+
+    def claim_url_of(vid_id: str, info: Dict) -> str:
+        return claim_url(target_of(vid_id, info)[0], info['title'])
+
+    # Resolve every candidate claim up front instead of once per video
+    daemon = DaemonClient(args.daemon_url)
+    claim_index = ClaimIndex(daemon, "claim_index.json")
+    if args.refresh_claims:
+        claim_index.names.clear()
+    claim_index.refresh(claim_url_of(vid_id, info) for videos in videos_by_channel for vid_id, info in videos)
+
+    # Two videos with the same claim name in one channel would overwrite each other; keep the oldest
+    for videos in videos_by_channel:
+        collisions = set(find_name_collisions(videos))
+        failed_ids.extend(vid_id for vid_id, _ in videos if vid_id in collisions)
+        videos[:] = [(vid_id, info) for vid_id, info in videos if vid_id not in collisions]
+
+    # Channels take turns, so downloads and publishes are shared fairly between them; each stays oldest first
+    videos_sorted = interleave(videos_by_channel)
+
+    # The coordinator's job ends once the videos without a claim are queued for the workers
+    if job_queue and args.role == 'coordinator':
+        # Jobs carry their Odysee channel and bid, since workers don't read the channel config
+        queued = job_queue.enqueue((vid_id, {**info, 'odysee_channel': targets[vid_id][0], 'bid': targets[vid_id][1]})
+                                   for vid_id, info in videos_sorted if claim_url_of(vid_id, info) not in claim_index)
+        counts = job_queue.counts()
+        log_event(f"Queued {queued} new jobs in {args.queue_db}; queue now has "
+                  f"{', '.join(f'{n} {status}' for status, n in sorted(counts.items()))}", stage='run')
+        log_event("Name collisions not queued:", stage='run')
+        log_event(" ".join(failed_ids), stage='run', ids=failed_ids)
+        job_queue.close()
+        video_log.close()
+        rate_limiter.save()
+        youtube.close()
+        if exporter:
+            exporter.close()
+        if args.profile:
+            write_profile(profile_file, run_id, metrics, time.monotonic() - run_started)
+        print(f"Queued {queued} videos for workers in {args.queue_db}. See {log_file} for details.")
+        return
+
+    # Blob reflection runs in the background so the next publish doesn't wait for it
+    reflector = ReflectorWorker(daemon, args.blob_dir, args.blob_clean_threshold)
+
+    # Record each video's progress; with --resume, continue from the last completed stage
+    state = MigrationState("video_log.db")
+    pending_videos: List[Tuple[str, Dict]] = []
     for vid_id, info in videos_sorted:
-        with open(log_file, 'a', encoding='utf-8') as log:
-            log.write(f"Processing {info['title']} (ID: {vid_id})\n")
+        record = state.get(vid_id)
+        if record is None or not args.resume:
+            state.set_stage(vid_id, 'discovered')
+        elif record['stage'] == 'cleaned':
+            log_event(f"Already migrated {info['title']} (ID: {vid_id}) in a previous run. Skipping.", stage='run', vid_id=vid_id)
+            continue
+        elif record['stage'] in ('published', 'reflected'):
+            log_event(f"Resuming {info['title']} (ID: {vid_id}) after stage '{record['stage']}'", stage='run', vid_id=vid_id)
+            on_done = finish_reflection(state, vid_id, info['title'], args.temp_folder)
+            if record['stage'] == 'published' and record['sd_hash']:
+                reflector.submit(record['sd_hash'], info['title'], on_done, vid_id)
+            else:
+                on_done(True)
+            continue
+        pending_videos.append((vid_id, info))
 
-        # Check if claim already exists on Odysee before downloading
-        video_name = sanitize_name(info['title'])
-        if claim_exists(video_name, log_file):
-            continue  # Skip download and upload, don't add to lists
+    # Process each video in sorted order; with --prefetch, downloads run ahead of publishing in a background thread
+    media_pool = MediaPool(args.media_workers, args.loudness_target if args.normalize_audio else None)
+    # Downloads that fail to publish stay in the cache for the next attempt instead of being downloaded again
+    cache = DownloadCache("video_log.db", args.cache_max_bytes)
+    cache.evict()
+    # Workers lease jobs from the shared queue as they go; the heartbeat keeps leases alive during long uploads
+    lease_keeper = LeaseKeeper(job_queue, args.worker_id, args.lease_seconds, args.max_lease_hours * 3600) if job_queue else None
+    videos_to_process = iter_leased_jobs(lease_keeper, claim_index) if lease_keeper else pending_videos
+    downloads = iter_downloaded_videos(videos_to_process, claim_index, claim_url_of, state, args.resume, media_pool, args.temp_folder,
+                                       youtube, rate_limiter, cache)
+
+    # Publish one downloaded video; with --publish-workers this runs on several threads at once
+    def publish_video(vid_id: str, info: Dict, download: Dict) -> None:
+        try:
+            publish_downloaded_video(vid_id, info, download)
+        except Exception:
+            if vid_id not in successful_ids:
+                failed_ids.append(vid_id)
+            raise  # PublishScheduler logs it
+        finally:
+            # A download kept for the next attempt can be evicted again from here on
+            cache.release(vid_id)
+            # Hand the job back if it failed before its outcome was recorded; otherwise the lease is renewed forever
+            if lease_keeper:
+                lease_keeper.finish(vid_id, False)
 
-        video_path = download_video(vid_id, args.temp_folder, args.cookies, log_file)
-        if not video_path:
-            with open(log_file, 'a', encoding='utf-8') as log:
-                log.write(f"Download failed for {info['title']}\n")
+    def publish_downloaded_video(vid_id: str, info: Dict, download: Dict) -> None:
+        try:
+            media_result = download['media_job'].result()
+        except Exception as e:
+            log_event(f"Media processing failed for {info['title']}: {e}", level=logging.WARNING, stage='media', error=str(e), vid_id=vid_id)
             failed_ids.append(vid_id)
-            continue
+            if lease_keeper:
+                lease_keeper.finish(vid_id, False)
+            cache.discard(vid_id)
+            delete_video_files(vid_id, info['title'], args.temp_folder)
+            return
+        # Keep the final file's media descriptor with its video_log entry for later runs
+        media = dict(download['media'] or {})
+        media.update(width=media_result['width'], height=media_result['height'],
+                     filesize=os.path.getsize(media_result['path']))
+        if media_result['converted']:
+            media.update(vcodec='h264', acodec='aac')
+        video_log[vid_id] = {**info, 'media': media}
+        state.set_stage(vid_id, 'downloaded', video_path=media_result['path'])
+        if args.cache_max_bytes and download.get('format_id'):
+            cache.put(vid_id, download['format_id'], media_result['path'], media)
+        dimensions = get_media_dimensions(media)
+        is_vertical = dimensions[1] > dimensions[0] if dimensions else None
 
-        success = upload_to_odysee(video_path, info['thumbnail'], info['title'], info['description'], ODYSEE_CHANNEL_NAME,
-                                   ODYSEE_BID, log_file, info['duration'], info['upload_date'], info['type'], info.get('tags', []))
-        if success:
+        channel_name, bid = target_of(vid_id, info)
+        if lease_keeper and not lease_keeper.still_held(vid_id):
+            # Another worker may be publishing it already; a second publish would make a duplicate claim
+            log_event(f"Lost the lease on {info['title']} (ID: {vid_id}) before publishing; leaving it to the worker that has it.",
+                      level=logging.WARNING, stage='publish', vid_id=vid_id)
+            result = None
+        else:
+            result = upload_to_odysee(media_result['path'], info['thumbnail'], info['title'], info['description'], channel_name,
+                                      bid, info['duration'], info['upload_date'], info['type'], info.get('tags', []),
+                                      daemon, download.get('web_optimized', False), is_vertical, vid_id)
+        if result:
+            sd_hash = get_publish_sd_hash(result)
+            state.set_stage(vid_id, 'published', claim_id=get_publish_claim_id(result), sd_hash=sd_hash)
+            claim_index.add(claim_url(channel_name, info['title']))
             successful_ids.append(vid_id)
+            if lease_keeper:
+                lease_keeper.finish(vid_id, True)
+            cache.discard(vid_id)
+            # Reflect just this stream's blobs; the files are deleted once that's done
+            if sd_hash:
+                reflector.submit(sd_hash, info['title'], finish_reflection(state, vid_id, info['title'], args.temp_folder), vid_id)
+                return
+            log_event(f"No sd_hash in publish result for {info['title']}; its blobs will not be reflected.", stage='publish', vid_id=vid_id)
         else:
             failed_ids.append(vid_id)
+            if lease_keeper:
+                lease_keeper.finish(vid_id, False)
+            if args.cache_max_bytes:
+                return  # Keep the file cached for the next attempt
 
-        # Delete all related files
-        try:
-            # Find all files starting with vid_id
-            related_files = glob.glob(os.path.join(args.temp_folder, f"{vid_id}*"))
-            if not related_files:
-                with open(log_file, 'a', encoding='utf-8') as log:
-                    log.write(f"No files found to delete for {info['title']} (ID: {vid_id})\n")
-            for file_path in related_files:
-                if os.path.isfile(file_path):
-                    try:
-                        os.remove(file_path)
-                        with open(log_file, 'a', encoding='utf-8') as log:
-                            log.write(f"Deleted file: {file_path}\n")
-                    except PermissionError as e:
-                        with open(log_file, 'a', encoding='utf-8') as log:
-                            log.write(f"Failed to delete {file_path}: {e} (file may be in use)\n")
-                    except Exception as e:
-                        with open(log_file, 'a', encoding='utf-8') as log:
-                            log.write(f"Failed to delete {file_path}: {e}\n")
-        except Exception as e:
-            with open(log_file, 'a', encoding='utf-8') as log:
-                log.write(f"Error while attempting to delete files for {info['title']}: {e}\n")
+        delete_video_files(vid_id, info['title'], args.temp_folder)
+
+    # Publishes run in parallel when the wallet has been split into enough outputs to pay for them at the same time
+    bids = [bid for _, bid in targets.values()]
+    if lease_keeper:
+        bids.append(job_queue.largest_bid() or ODYSEE_BID)  # Workers only learn each job's bid from the queue
+    largest_bid = max(bids, key=float, default=ODYSEE_BID)
+    publish_slots = prepare_wallet_outputs(daemon, args.publish_workers, largest_bid) if args.publish_workers > 1 else 1
+    scheduler = PublishScheduler(min(args.publish_workers, publish_slots))
+    for vid_id, info, download in prefetch(downloads, args.prefetch):
+        if not download:
+            log_event(f"Download failed for {info['title']}", level=logging.WARNING, stage='download', vid_id=vid_id)
+            failed_ids.append(vid_id)
+            if lease_keeper:
+                lease_keeper.finish(vid_id, False)
+            continue
+
+        scheduler.submit(vid_id, publish_video, vid_id, info, download)
+
+    scheduler.close()
+    if lease_keeper:
+        lease_keeper.close()
+    if job_queue:
+        job_queue.close()
+    media_pool.close()
+    reflector.close()
+    cache.close()
+    state.close()
+    video_log.close()
+    rate_limiter.save()
+    youtube.close()
+    if exporter:
+        exporter.close()
+    if args.profile:
+        write_profile(profile_file, run_id, metrics, time.monotonic() - run_started)
 
     # Log completion and upload summaries
-    with open(log_file, 'a', encoding='utf-8') as log:
-        log.write(f"Completed migration on {datetime.datetime.now()}\n")
-        log.write("Successful Uploads:\n")
-        log.write(" ".join(successful_ids) + "\n" if successful_ids else "\n")
-        log.write("Failed Uploads:\n")
-        log.write(" ".join(failed_ids) + "\n" if failed_ids else "\n")
+    log_event(f"Completed migration on {datetime.datetime.now()}", stage='run', duration=time.monotonic() - run_started,
+              successful=len(successful_ids), failed=len(failed_ids))
+    log_event(f"Final YouTube request pacing: {rate_limiter.rate:.3f} requests/second "
+              f"({rate_limiter.successes} successful, {rate_limiter.throttles} throttled)", stage='run', rate=rate_limiter.rate)
+    log_event("Successful Uploads:", stage='run')
+    log_event(" ".join(successful_ids), stage='run', ids=successful_ids)
+    log_event("Failed Uploads:", stage='run')
+    log_event(" ".join(failed_ids), stage='run', ids=failed_ids)
+    logging.shutdown()
     print(f"Migration complete. See {log_file} for details.")
 
 if __name__ == "__main__":